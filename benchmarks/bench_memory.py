@@ -0,0 +1,90 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from time import perf_counter
+
+import numpy as np
+
+from debatrix.panel.interface.common.index import (
+    EmbeddingDType,
+    MemoryConfig,
+    VectorIndex,
+    VectorIndexBackend,
+    create_vector_index,
+)
+
+
+@dataclass
+class ScriptArgs:
+    size: int = 20000
+    dim: int = 1536
+    queries: int = 100
+    k: int = 8
+    clusters: int = 256
+    seed: int = 0
+
+
+def make_data(args: ScriptArgs, /) -> tuple[np.ndarray, np.ndarray]:
+    gen: np.random.Generator = np.random.default_rng(args.seed)
+    centers: np.ndarray = gen.standard_normal((args.clusters, args.dim))
+
+    def sample(n: int) -> np.ndarray:
+        x: np.ndarray = centers[gen.integers(0, args.clusters, n)]
+        x = x + 0.5 * gen.standard_normal((n, args.dim))
+        return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+    return sample(args.size), sample(args.queries)
+
+
+def evaluate(
+    config: MemoryConfig, data: np.ndarray, queries: np.ndarray, truth: list[set[int]], k: int
+) -> tuple[float, float, float, float]:
+    start: float = perf_counter()
+    index: VectorIndex = create_vector_index(config)
+
+    for i in range(0, len(data), 512):
+        index.add(data[i : i + 512])
+
+    build_time: float = perf_counter() - start
+    candidates: list[int] = list(range(len(data)))
+    recall: float = 0
+    start = perf_counter()
+
+    for i, query in enumerate(queries):
+        recall += len(truth[i] & set(index.search(query[None, :], candidates, k=k))) / k
+
+    latency: float = (perf_counter() - start) / len(queries)
+    return index.nbytes / 2**20, build_time, latency * 1000, recall / len(queries)
+
+
+def main(args: ScriptArgs) -> None:
+    data: np.ndarray
+    queries: np.ndarray
+    data, queries = make_data(args)
+
+    truth: list[set[int]] = [
+        set(np.argpartition(-(data @ query), args.k - 1)[: args.k].tolist()) for query in queries
+    ]
+
+    print(f"{'backend':<8} {'dtype':<8} {'MiB':>8} {'build s':>8} {'query ms':>9} {'recall':>7}")
+
+    for backend in VectorIndexBackend:
+        for dtype in EmbeddingDType:
+            config: MemoryConfig = MemoryConfig(index_backend=backend, storage_dtype=dtype)
+            mib, build, latency, recall = evaluate(config, data, queries, truth, args.k)
+
+            print(
+                f"{backend:<8} {dtype:<8} {mib:>8.1f} {build:>8.2f} {latency:>9.2f} {recall:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Debatrix memory index benchmark")
+
+    arg_parser.add_argument("-n", "--size", type=int, default=20000, help="number of vectors")
+    arg_parser.add_argument("-d", "--dim", type=int, default=1536, help="embedding dimension")
+    arg_parser.add_argument("-q", "--queries", type=int, default=100, help="number of queries")
+    arg_parser.add_argument("-k", type=int, default=8, help="retrieve top k")
+    arg_parser.add_argument("-c", "--clusters", type=int, default=256, help="synthetic clusters")
+    arg_parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+    main(arg_parser.parse_args(namespace=ScriptArgs()))
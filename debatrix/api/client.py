@@ -1,12 +1,13 @@
 from asyncio import CancelledError
 from logging import Logger, getLogger, WARNING
 from collections.abc import AsyncIterator, Mapping
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, Literal, TypeVar
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
 from tenacity import (
     AsyncRetrying,
+    retry_if_exception,
     retry_unless_exception_type,
     stop_after_attempt,
     wait_random,
@@ -14,17 +15,20 @@ from tenacity import (
 )
 
 from ..util import sanitize
-from .common import APIResponse, ServerInfo
+from .common import STATUS_INTERVAL, APIResponse, ServerInfo
 from .util import pydantic_dump_json, pydantic_load_json
 
 T = TypeVar("T")
 
 
 class APIClient:
-    def __init__(self, *, timeout: int = 30) -> None:
+    def __init__(self, *, timeout: int = 30, direct_call: bool = True) -> None:
         self._info_updated: bool = False
         self._opened_session: ClientSession | None = None
         self._timeout = ClientTimeout(total=timeout)
+        self._call_timeout = ClientTimeout(total=None, sock_read=max(timeout, 3 * STATUS_INTERVAL))
+        self._direct_call = direct_call
+        self._call_supported: bool | None = None
         self._logger: Logger = getLogger(__name__)
 
     @property
@@ -39,6 +43,7 @@ class APIClient:
         if self._opened_session is None or info != self._server_info:
             self._server_info = info
             self._info_updated = True
+            self._call_supported = None
 
     async def close(self) -> None:
         if self._opened_session is not None:
@@ -56,34 +61,86 @@ class APIClient:
         max_retries: int = 3,
     ) -> T | None:
         key: str | None = None
+        call_keys: list[str] = []
 
         try:
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(max_retries),
-                wait=wait_random(),
-                before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
-            ):
-                with attempt:
-                    async with self._request(path, data, extra_headers=extra_headers) as response:
-                        text: str = await response.text(encoding="utf8")
-                        if response.status != 200:
-                            raise RuntimeError(response.status, text)
+            if self._direct_call and self._call_supported is not False:
+                try:
+                    async for attempt in AsyncRetrying(
+                        stop=stop_after_attempt(max_retries),
+                        wait=wait_random(),
+                        retry=retry_if_exception(lambda _: len(call_keys) == 0),
+                        before_sleep=before_sleep_log(
+                            self._logger, log_level=WARNING, exc_info=True
+                        ),
+                    ):
+                        with attempt:
+                            async with self._request(
+                                f"{path}/call",
+                                data,
+                                extra_headers=extra_headers,
+                                timeout=self._call_timeout,
+                            ) as response:
+                                if response.status in (404, 405):
+                                    self._call_supported = False
+                                    break
 
-                    key: str | None = self._parse(text, str)[1]
-                    assert key is not None
+                                if response.status != 200:
+                                    text: str = await response.text(encoding="utf8")
+                                    raise RuntimeError(response.status, text)
 
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(max_retries),
-                wait=wait_random(),
-                before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
-            ):
-                with attempt:
-                    async with self._request(f"{path}/start?key={key}", mode="put") as response:
-                        text: str = await response.text(encoding="utf8")
-                        if response.status != 200:
-                            raise RuntimeError(response.status, text)
+                                self._call_supported = True
+
+                                async for line in response.content:
+                                    if key is None:
+                                        key = self._parse(line.decode("utf8"), str)[1]
+                                        assert key is not None
+                                        call_keys.append(key)
+                                        continue
+
+                                    finished: bool
+                                    result: T | None
+                                    finished, result = self._parse(line.decode("utf8"), output_type)
 
-                    self._parse(text, bool)
+                                    if finished:
+                                        return result
+                except ClientError:
+                    if key is None:
+                        raise
+
+                    self._logger.warning(
+                        "direct call to %s interrupted, polling status instead", path, exc_info=True
+                    )
+
+            if key is None:
+                async for attempt in AsyncRetrying(
+                    stop=stop_after_attempt(max_retries),
+                    wait=wait_random(),
+                    before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+                ):
+                    with attempt:
+                        async with self._request(
+                            path, data, extra_headers=extra_headers
+                        ) as response:
+                            text: str = await response.text(encoding="utf8")
+                            if response.status != 200:
+                                raise RuntimeError(response.status, text)
+
+                        key = self._parse(text, str)[1]
+                        assert key is not None
+
+                async for attempt in AsyncRetrying(
+                    stop=stop_after_attempt(max_retries),
+                    wait=wait_random(),
+                    before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+                ):
+                    with attempt:
+                        async with self._request(f"{path}/start?key={key}", mode="put") as response:
+                            text: str = await response.text(encoding="utf8")
+                            if response.status != 200:
+                                raise RuntimeError(response.status, text)
+
+                        self._parse(text, bool)
 
             async for attempt in AsyncRetrying(
                 stop=stop_after_attempt(max_retries),
@@ -131,6 +188,56 @@ class APIClient:
 
             raise
 
+    async def query_stream(
+        self,
+        path: str,
+        data: Any | None = None,
+        /,
+        *,
+        output_type: type[T],
+        extra_headers: Mapping[str, str] | None = None,
+        max_retries: int = 3,
+    ) -> AsyncIterator[T]:
+        async with AsyncExitStack() as stack:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(max_retries),
+                wait=wait_random(),
+                before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+                reraise=True,
+            ):
+                with attempt:
+                    async with AsyncExitStack() as attempt_stack:
+                        response: ClientResponse = await attempt_stack.enter_async_context(
+                            self._request(
+                                path, data, extra_headers=extra_headers, timeout=self._call_timeout
+                            )
+                        )
+
+                        if response.status != 200:
+                            text: str = await response.text(encoding="utf8")
+                            raise RuntimeError(response.status, text)
+
+                        line: bytes = await response.content.readline()
+                        if line == b"":
+                            raise RuntimeError(f"stream from {path} ended before its first line")
+
+                        stack.push_async_exit(attempt_stack.pop_all())
+
+            while line != b"":
+                finished: bool
+                result: T | None
+                finished, result = self._parse(line.decode("utf8"), output_type)
+
+                if finished:
+                    return
+
+                if result is not None:
+                    yield result
+
+                line = await response.content.readline()
+
+        raise RuntimeError(f"stream from {path} ended unexpectedly")
+
     @asynccontextmanager
     async def _request(
         self,
@@ -140,6 +247,7 @@ class APIClient:
         *,
         mode: Literal["post", "put", "get"] = "post",
         extra_headers: Mapping[str, str] | None = None,
+        timeout: ClientTimeout | None = None,
     ) -> AsyncIterator[ClientResponse]:
         if self._info_updated:
             await self.close()
@@ -157,18 +265,22 @@ class APIClient:
 
             data = pydantic_dump_json(data).encode()
 
+        timeout = sanitize(timeout, self._timeout)
+
         if mode == "post":
             async with self._session.post(
-                f"{self.sub_path}{path}", data=data, headers=headers
+                f"{self.sub_path}{path}", data=data, headers=headers, timeout=timeout
             ) as response:
                 yield response
         elif mode == "put":
             async with self._session.put(
-                f"{self.sub_path}{path}", data=data, headers=headers
+                f"{self.sub_path}{path}", data=data, headers=headers, timeout=timeout
             ) as response:
                 yield response
         elif mode == "get":
-            async with self._session.get(f"{self.sub_path}{path}", headers=headers) as response:
+            async with self._session.get(
+                f"{self.sub_path}{path}", headers=headers, timeout=timeout
+            ) as response:
                 yield response
         else:
             raise RuntimeError(mode)
@@ -6,6 +6,8 @@ from pydantic.dataclasses import dataclass
 T = TypeVar("T")
 P = ParamSpec("P")
 
+STATUS_INTERVAL: float = 10
+
 
 @dataclass(frozen=True, kw_only=True)
 class APIResponse(Generic[T]):
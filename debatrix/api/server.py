@@ -1,35 +1,41 @@
 from abc import ABC, abstractmethod
-from asyncio import sleep
-from collections import deque
-from collections.abc import Callable, Coroutine
+from asyncio import Task, create_task, wait
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine
 from functools import wraps
+from logging import Logger, getLogger
 from typing import Any, ParamSpec
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.background import BackgroundTask
 
-from .common import APIResponse
-from .session import SessionCache
-from .util import prettify_exception
+from .common import STATUS_INTERVAL, APIResponse
+from .session import SessionCache, SessionCacheStats
+from .util import prettify_exception, pydantic_dump_json
 
 P = ParamSpec("P")
 
 
 class APIServer(ABC):
     def __init__(self) -> None:
-        self._cache_queue: deque[int] = deque()
-        self._cache_result: dict[int, APIResponse] = {}
+        self._caches: dict[str, SessionCache] = {}
+        self._logger: Logger = getLogger(__name__)
 
     @property
     def app(self) -> FastAPI:
         return self._app
 
+    @property
+    def cache_stats(self) -> dict[str, SessionCacheStats]:
+        return {path: cache.stats for path, cache in self._caches.items()}
+
     def init_app(self, /, *, debug: bool = False) -> None:
         self._app = FastAPI(debug=debug)
+        self._app.get("/stats", response_model=dict[str, SessionCacheStats])(self._stats)
 
     def assign(self, path: str, func: Callable[P, Coroutine[Any, Any, Any]]) -> None:
         cache = SessionCache(func=func)
+        self._caches[path] = cache
 
         @wraps(
             func,
@@ -46,6 +52,30 @@ class APIServer(ABC):
                     finished=True, cancelled=False, error=prettify_exception(e), result=None
                 )
 
+        @wraps(
+            func,
+            assigned=("__module__", "__name__", "__qualname__", "__doc__"),
+            updated=("__annotations__", "__dict__"),
+        )
+        def call(*args: P.args, **kwargs: P.kwargs) -> StreamingResponse:
+            key: str = cache.assign(*args, **kwargs)
+            cache[key].is_started = True
+
+            async def stream() -> AsyncIterator[str]:
+                yield self._dump_line(
+                    APIResponse(finished=True, cancelled=False, error=None, result=key)
+                )
+
+                task: Task[None] = cache.run(key)
+
+                while not task.done():
+                    await wait((task,), timeout=STATUS_INTERVAL)
+                    yield self._dump_line(cache[key].response)
+
+                cache.release(key)
+
+            return StreamingResponse(stream(), media_type="application/x-ndjson")
+
         def start(key: str) -> JSONResponse:
             try:
                 if cache[key].is_started:
@@ -70,12 +100,11 @@ class APIServer(ABC):
 
         async def status(key: str) -> APIResponse:
             try:
-                for _ in range(1000):
-                    await sleep(0.01)
-                    if cache[key].response.finished:
-                        break
+                response: APIResponse = await cache[key].wait(max_wait=STATUS_INTERVAL)
+                if response.finished:
+                    cache.release(key)
 
-                return cache[key].response
+                return response
             except Exception as e:
                 return APIResponse(
                     finished=True, cancelled=False, error=prettify_exception(e), result=None
@@ -92,11 +121,89 @@ class APIServer(ABC):
                 )
 
         assign.__annotations__["return"] = APIResponse
+        call.__annotations__["return"] = StreamingResponse
         self._app.post(path, response_model=APIResponse[str])(assign)
+        self._app.post(f"{path}/call", response_model=None)(call)
         self._app.put(f"{path}/start", response_model=APIResponse[bool])(start)
         self._app.get(f"{path}/status", response_model=APIResponse)(status)
         self._app.put(f"{path}/cancel", response_model=APIResponse)(cancel)
 
+    def assign_stream(self, path: str, func: Callable[P, AsyncGenerator[Any]]) -> None:
+        @wraps(
+            func,
+            assigned=("__module__", "__name__", "__qualname__", "__doc__"),
+            updated=("__annotations__", "__dict__"),
+        )
+        def stream(*args: P.args, **kwargs: P.kwargs) -> StreamingResponse:
+            generator: AsyncGenerator[Any] = func(*args, **kwargs)
+
+            async def step() -> tuple[bool, Any]:
+                try:
+                    return True, await anext(generator)
+                except StopAsyncIteration:
+                    return False, None
+
+            async def lines() -> AsyncIterator[str]:
+                task: Task[tuple[bool, Any]] | None = None
+
+                try:
+                    while True:
+                        if task is None:
+                            task = create_task(step())
+
+                        await wait((task,), timeout=STATUS_INTERVAL)
+
+                        if not task.done():
+                            yield self._dump_line(
+                                APIResponse(
+                                    finished=False, cancelled=False, error=None, result=None
+                                )
+                            )
+
+                            continue
+
+                        has_next: bool
+                        chunk: Any
+                        has_next, chunk = task.result()
+                        task = None
+
+                        if not has_next:
+                            break
+
+                        yield self._dump_line(
+                            APIResponse(finished=False, cancelled=False, error=None, result=chunk)
+                        )
+
+                    yield self._dump_line(
+                        APIResponse(finished=True, cancelled=False, error=None, result=None)
+                    )
+                except Exception as e:
+                    self._logger.exception("stream from %s failed", path)
+
+                    yield self._dump_line(
+                        APIResponse(
+                            finished=True, cancelled=False, error=prettify_exception(e), result=None
+                        )
+                    )
+                finally:
+                    if task is not None and not task.done():
+                        task.cancel()
+                        await wait((task,))
+
+                    await generator.aclose()
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+        stream.__annotations__["return"] = StreamingResponse
+        self._app.post(path, response_model=None)(stream)
+
     @abstractmethod
     async def close(self) -> None:
         raise NotImplementedError()
+
+    async def _stats(self) -> dict[str, SessionCacheStats]:
+        return self.cache_stats
+
+    @staticmethod
+    def _dump_line(response: APIResponse, /) -> str:
+        return f"{pydantic_dump_json(response)}\n"
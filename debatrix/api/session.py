@@ -1,21 +1,21 @@
-from asyncio import CancelledError, Task, TaskGroup
+from asyncio import CancelledError, Event, Task, TaskGroup, create_task, timeout
 from collections.abc import Callable, Coroutine
-from queue import Queue
+from time import monotonic
 from typing import Any, Generic, ParamSpec, TypeVar
 from uuid import uuid4
 
-from pydantic import Field
+from pydantic import ConfigDict, Field
 from pydantic.dataclasses import dataclass
 
 from ..common import ANone
 from .common import APIResponse
-from .util import prettify_exception
+from .util import approximate_size, prettify_exception
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
 
-@dataclass
+@dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class SessionData(Generic[T]):
     bg_func: Callable[[], ANone]
     is_started: bool = False
@@ -26,24 +26,65 @@ class SessionData(Generic[T]):
         )
     )
 
+    finished: Event = Field(default_factory=Event)
+    expires_at: float = 0
+    size: int = 0
+
+    def finish(self, response: APIResponse[T], /) -> None:
+        self.response = response
+        self.finished.set()
+
+    async def wait(self, *, max_wait: float) -> APIResponse[T]:
+        try:
+            async with timeout(max_wait):
+                await self.finished.wait()
+        except TimeoutError:
+            pass
+
+        return self.response
+
+
+@dataclass(frozen=True, kw_only=True)
+class SessionCacheStats:
+    size: int
+    running: int
+    approx_bytes: int
+
 
 class SessionCache(Generic[P, T]):
     def __init__(
-        self, *, func: Callable[P, Coroutine[Any, Any, T]], max_size: int = 100000
+        self,
+        *,
+        func: Callable[P, Coroutine[Any, Any, T]],
+        max_size: int = 100000,
+        ttl: float = 600,
+        release_grace: float = 30,
     ) -> None:
         self._func = func
         self._max_size = max_size
+        self._ttl = ttl
+        self._release_grace = release_grace
 
         self._cache: dict[str, SessionData[T]] = {}
+        self._released: dict[str, SessionData[T]] = {}
         self._task_pool: dict[str, Task[Any]] = {}
-        self._queue: Queue[str] = Queue()
+        self._runners: set[Task[None]] = set()
+        self._bytes: int = 0
 
     def __getitem__(self, key: str, /) -> SessionData[T]:
-        return self._cache[key]
+        data: SessionData[T] | None = self._cache.get(key)
+        return self._released[key] if data is None else data
+
+    @property
+    def stats(self) -> SessionCacheStats:
+        return SessionCacheStats(
+            size=len(self._cache) + len(self._released),
+            running=len(self._task_pool),
+            approx_bytes=self._bytes,
+        )
 
     def assign(self, *args: P.args, **kwargs: P.kwargs) -> str:
         key: str = self._generate_key()
-        self._queue.put_nowait(key)
 
         async def bg_func() -> None:
             try:
@@ -52,27 +93,57 @@ class SessionCache(Generic[P, T]):
                         task: Task[T] = tg.create_task(self._func(*args, **kwargs))
                         self._task_pool[key] = task
 
-                    self[key].response = APIResponse(
-                        finished=True, cancelled=False, error=None, result=task.result()
+                    data.finish(
+                        APIResponse(
+                            finished=True, cancelled=False, error=None, result=task.result()
+                        )
                     )
                 except CancelledError as e:
-                    self[key].response = APIResponse(
-                        finished=True, cancelled=True, error=prettify_exception(e), result=None
+                    data.finish(
+                        APIResponse(
+                            finished=True, cancelled=True, error=prettify_exception(e), result=None
+                        )
                     )
 
             except Exception as e:
                 print(prettify_exception(e))
 
-                self[key].response = APIResponse(
-                    finished=True, cancelled=False, error=prettify_exception(e), result=None
+                data.finish(
+                    APIResponse(
+                        finished=True, cancelled=False, error=prettify_exception(e), result=None
+                    )
                 )
 
             if key in self._task_pool:
                 del self._task_pool[key]
 
-        self._cache[key] = SessionData(bg_func=bg_func)
+            if self._cache.get(key) is data:
+                data.size = approximate_size(data.response)
+                self._bytes += data.size
+                self._touch(key)
+
+        data: SessionData[T] = SessionData(bg_func=bg_func)
+        self._cache[key] = data
+        self._touch(key)
         return key
 
+    def run(self, key: str, /) -> Task[None]:
+        task: Task[None] = create_task(self[key].bg_func())
+        self._runners.add(task)
+        task.add_done_callback(self._runners.discard)
+        return task
+
+    def release(self, key: str, /) -> None:
+        data: SessionData[T] | None = self._cache.pop(key, None)
+        if data is None:
+            return
+
+        if data.finished.is_set() and self._release_grace > 0:
+            data.expires_at = monotonic() + self._release_grace
+            self._released[key] = data
+        else:
+            self._bytes -= data.size
+
     async def cancel(self, key: str, /) -> bool:
         if key in self._task_pool and not self._task_pool[key].done():
             self._task_pool[key].cancel()
@@ -86,13 +157,36 @@ class SessionCache(Generic[P, T]):
         else:
             return True
 
+    def _touch(self, key: str, /) -> None:
+        data: SessionData[T] = self._cache.pop(key)
+        data.expires_at = monotonic() + self._ttl
+        self._cache[key] = data
+
     def _generate_key(self) -> str:
-        while len(self._cache) > self._max_size:
-            old_key: str = self._queue.get_nowait()
+        now: float = monotonic()
+
+        while len(self._cache) > 0:
+            old_key: str = next(iter(self._cache))
 
-            if old_key in self._cache:
-                del self._cache[old_key]
+            if len(self._cache) < self._max_size:
+                if self._cache[old_key].expires_at > now:
+                    break
+
+                if old_key in self._task_pool:
+                    self._touch(old_key)
+                    continue
+
+            self.release(old_key)
             if old_key in self._task_pool:
                 del self._task_pool[old_key]
 
+        while len(self._released) > 0:
+            released_key: str = next(iter(self._released))
+
+            if len(self._cache) + len(self._released) < self._max_size:
+                if self._released[released_key].expires_at > now:
+                    break
+
+            self._bytes -= self._released.pop(released_key).size
+
         return uuid4().hex
@@ -1,3 +1,4 @@
+from sys import getsizeof
 from traceback import format_exception
 from typing import Any, TypeVar
 
@@ -16,3 +17,18 @@ def pydantic_load_json(json: str, target: type[T], /) -> T:
 
 def prettify_exception(e: BaseException) -> str:
     return "".join(format_exception(e))
+
+
+def approximate_size(obj: Any, /) -> int:
+    size: int = getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, int, float)) or obj is None:
+        return size
+    elif isinstance(obj, dict):
+        return size + sum(approximate_size(k) + approximate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(approximate_size(item) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        return size + approximate_size(vars(obj))
+    else:
+        return size
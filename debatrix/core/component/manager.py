@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from asyncio import Queue, Task, TaskGroup
+from asyncio import Queue, Semaphore, Task, TaskGroup
 from typing import Generic, TypeVar
 
 from ..common import DebateInfo, DebateResult, DebaterName, DimensionalVerdict, Speech, Verdict
@@ -32,7 +32,7 @@ class BaseManager(DebateObject, Generic[AT, PT]):
         self._debate_info = debate_info
         await self.arena.update_info()
 
-    async def run(self, *, should_summarize: bool) -> DebateResult:
+    async def run(self, *, should_summarize: bool, update_window: int = 1) -> DebateResult:
         async with TaskGroup() as tg:
             tg.create_task(self.arena.reset())
             tg.create_task(self.panel.reset())
@@ -48,7 +48,9 @@ class BaseManager(DebateObject, Generic[AT, PT]):
             tg.create_task(self._fetch(queue=queue))
 
             judge_task: Task[DebateResult] = tg.create_task(
-                self._judge(queue=queue, should_summarize=should_summarize)
+                self._judge(
+                    queue=queue, should_summarize=should_summarize, update_window=update_window
+                )
             )
 
         return judge_task.result()
@@ -74,15 +76,26 @@ class BaseManager(DebateObject, Generic[AT, PT]):
             queue.put_nowait(speech)
             await self.arena.update(speech=speech)
 
-    async def _judge(self, *, queue: Queue[Speech | None], should_summarize: bool) -> DebateResult:
+    async def _judge(
+        self, *, queue: Queue[Speech | None], should_summarize: bool, update_window: int
+    ) -> DebateResult:
         speeches: list[Speech] = []
+        window = Semaphore(max(update_window, 1))
 
-        while True:
-            speech: Speech | None = await queue.get()
-            if speech is None:
-                break
+        async def update(speech: Speech) -> None:
+            try:
+                await self.panel.update(speech=speech)
+            finally:
+                window.release()
+
+        async with TaskGroup() as tg:
+            while True:
+                speech: Speech | None = await queue.get()
+                if speech is None:
+                    break
 
-            await self.panel.update(speech=speech)
+                await window.acquire()
+                tg.create_task(update(speech))
 
         dimensional_verdicts: tuple[DimensionalVerdict, ...] = await self.panel.dimensional_judge()
         final_verdict: Verdict | None = None
@@ -51,7 +51,9 @@ class Manager(BaseManager[Arena, Panel]):
         await self.panel.set_dimensions(config.dimensions)
 
     async def run(self) -> DebateResult:
-        return await super().run(should_summarize=self.config.should_summarize)
+        return await super().run(
+            should_summarize=self.config.should_summarize, update_window=self.config.update_window
+        )
 
     async def close(self) -> None:
         async with TaskGroup() as tg:
@@ -10,3 +10,4 @@ Dimensions = tuple[DimensionInfo, ...]
 class ManagerConfig:
     should_summarize: bool
     dimensions: Dimensions
+    update_window: int = 1
@@ -1,6 +1,8 @@
+from .cache import CacheBackend, CacheConfig
 from .client import ModelClient
 from .common import ChatHistory, ChatMessage, ChatRole
 from .config import ModelConfig
+from .limiter import LimiterConfig
 from .server import ModelServer
 from .chat import ChatModelBackend
 from .embed import EmbedModelBackend
@@ -11,6 +13,9 @@ __all__ = [
     "ChatHistory",
     "ChatModelBackend",
     "EmbedModelBackend",
+    "CacheBackend",
+    "CacheConfig",
+    "LimiterConfig",
     "ModelConfig",
     "ModelServer",
     "ModelClient",
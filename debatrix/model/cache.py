@@ -0,0 +1,265 @@
+import enum
+import sqlite3
+from abc import ABC, abstractmethod
+from asyncio import get_running_loop
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic.dataclasses import dataclass
+
+from ..util import sanitize
+
+T = TypeVar("T")
+
+
+@enum.unique
+class CacheBackend(enum.StrEnum):
+    NONE = enum.auto()
+    MEMORY = enum.auto()
+    DISK = enum.auto()
+
+
+@dataclass(frozen=True, kw_only=True)
+class CacheConfig:
+    backend: CacheBackend = CacheBackend.NONE
+    path: str = ""
+    max_size: int = 100000
+
+
+@dataclass(frozen=True, kw_only=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+
+
+class CacheStore(ABC):
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_many(self, keys: list[str], /) -> list[bytes | None]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def put_many(self, items: list[tuple[str, bytes]], /) -> None:
+        raise NotImplementedError()
+
+    async def get(self, key: str, /) -> bytes | None:
+        return (await self.get_many([key]))[0]
+
+    async def put(self, key: str, value: bytes, /) -> None:
+        await self.put_many([(key, value)])
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheStore(CacheStore):
+    def __init__(self, *, max_size: int) -> None:
+        self._max_size = max_size
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
+    async def get_many(self, keys: list[str], /) -> list[bytes | None]:
+        values: list[bytes | None] = [self._data.get(key) for key in keys]
+
+        for key, value in zip(keys, values):
+            if value is not None:
+                self._data.move_to_end(key)
+
+        return values
+
+    async def put_many(self, items: list[tuple[str, bytes]], /) -> None:
+        for key, value in items:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+
+class DiskCacheStore(CacheStore):
+    USED_FLUSH_SIZE: int = 256
+
+    def __init__(self, *, path: str, max_size: int) -> None:
+        self._max_size = max_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        self._executor.submit(self._open, path).result()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    async def get_many(self, keys: list[str], /) -> list[bytes | None]:
+        return await self._run(self._get_many, keys)
+
+    async def put_many(self, items: list[tuple[str, bytes]], /) -> None:
+        await self._run(self._put_many, items)
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown()
+
+    async def _run(self, func: Callable[..., T], /, *args: Any) -> T:
+        return await get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open(self, path: str, /) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, used INTEGER NOT NULL)"
+        )
+
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_used ON cache (used)")
+        self._size: int = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+        self._clock: int = sanitize(
+            self._conn.execute("SELECT MAX(used) FROM cache").fetchone()[0], 0
+        )
+
+        self._used: dict[str, int] = {}
+
+    def _get_many(self, keys: list[str], /) -> list[bytes | None]:
+        values: list[bytes | None] = []
+
+        for key in keys:
+            row: tuple[bytes] | None = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                values.append(None)
+            else:
+                self._used[key] = self._tick()
+                values.append(row[0])
+
+        if len(self._used) >= self.USED_FLUSH_SIZE:
+            self._flush_used()
+
+        return values
+
+    def _put_many(self, items: list[tuple[str, bytes]], /) -> None:
+        for key, value in items:
+            exists: bool = (
+                self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone()
+                is not None
+            )
+
+            self._used.pop(key, None)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, used) VALUES (?, ?, ?)",
+                (key, value, self._tick()),
+            )
+
+            if not exists:
+                self._size += 1
+
+        if self._size > self._max_size:
+            self._flush_used()
+
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used LIMIT ?)",
+                (self._size - self._max_size,),
+            )
+
+            self._size = self._max_size
+
+    def _flush_used(self) -> None:
+        if len(self._used) > 0:
+            self._conn.executemany(
+                "UPDATE cache SET used = ? WHERE key = ?",
+                [(used, key) for key, used in self._used.items()],
+            )
+
+            self._used.clear()
+
+    def _close(self) -> None:
+        self._flush_used()
+        self._conn.close()
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+
+class ModelCache:
+    def __init__(self, *, store: CacheStore) -> None:
+        self._store = store
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(size=self._store.size, hits=self._hits, misses=self._misses)
+
+    async def get(self, key: str, /) -> bytes | None:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str], /) -> list[bytes | None]:
+        values: list[bytes | None] = await self._store.get_many(keys)
+        hits: int = sum(value is not None for value in values)
+        self._hits += hits
+        self._misses += len(values) - hits
+        return values
+
+    async def put(self, key: str, value: bytes, /) -> None:
+        await self._store.put(key, value)
+
+    async def put_many(self, items: list[tuple[str, bytes]], /) -> None:
+        await self._store.put_many(items)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return sha256("\0".join(parts).encode()).hexdigest()
+
+
+class CacheHub:
+    def __init__(self) -> None:
+        self._stores: dict[CacheConfig, CacheStore] = {}
+        self._caches: dict[tuple[str, CacheConfig], ModelCache] = {}
+
+    @property
+    def stats(self) -> dict[str, CacheStats]:
+        return {
+            f"{name}:{config.backend}:{config.path}": cache.stats
+            for (name, config), cache in self._caches.items()
+        }
+
+    def get(self, config: CacheConfig, /, *, name: str) -> ModelCache | None:
+        if config.backend == CacheBackend.NONE:
+            return None
+
+        if config not in self._stores:
+            if config.backend == CacheBackend.MEMORY:
+                self._stores[config] = MemoryCacheStore(max_size=config.max_size)
+            elif config.backend == CacheBackend.DISK:
+                self._stores[config] = DiskCacheStore(path=config.path, max_size=config.max_size)
+            else:
+                raise ValueError(config.backend)
+
+        if (name, config) not in self._caches:
+            self._caches[name, config] = ModelCache(store=self._stores[config])
+
+        return self._caches[name, config]
+
+    async def close(self) -> None:
+        for store in self._stores.values():
+            await store.close()
+
+        self._stores.clear()
+        self._caches.clear()
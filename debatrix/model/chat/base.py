@@ -1,15 +1,22 @@
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator
+from typing import Any
 
 from ..common import ChatHistory, ChatMessage
 
 
 class ChatModelABC(ABC):
     @abstractmethod
-    async def predict(self, *, messages: ChatHistory) -> AsyncIterator[ChatMessage]:
+    async def predict(self, *, messages: ChatHistory) -> ChatMessage:
         raise NotImplementedError()
-        yield
 
     @abstractmethod
-    async def predict(self, *, messages: ChatHistory) -> ChatMessage:
+    async def predict_structured(
+        self, *, messages: ChatHistory, name: str, json_schema: dict[str, Any]
+    ) -> ChatMessage:
         raise NotImplementedError()
+
+    @abstractmethod
+    async def predict_stream(self, *, messages: ChatHistory) -> AsyncGenerator[ChatMessage]:
+        raise NotImplementedError()
+        yield
@@ -1,4 +1,11 @@
-from ..common import ChatHistory, ChatMessage
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from typing import Any
+
+from ..cache import CacheHub
+from ..common import ChatHistory, ChatMessage, PromptUsage
+from ..limiter import LimiterHub
+from ..pool import ClientPool
 from .base import ChatModelABC
 from .config import ChatModelBackend, ChatModelConfig
 from .openai import OpenAIChatModel
@@ -6,9 +13,13 @@ from .test import TestChatModel
 
 
 class ChatModel(ChatModelABC):
-    def __init__(self) -> None:
+    def __init__(
+        self, *, cache_hub: CacheHub, limiter_hub: LimiterHub, client_pool: ClientPool
+    ) -> None:
         self._test_model = TestChatModel()
-        self._openai_model = OpenAIChatModel()
+        self._openai_model = OpenAIChatModel(
+            cache_hub=cache_hub, limiter_hub=limiter_hub, client_pool=client_pool
+        )
 
     @property
     def config(self) -> ChatModelConfig:
@@ -20,12 +31,25 @@ class ChatModel(ChatModelABC):
         self._test_model.config = config.test_config
         self._openai_model.config = config.openai_config
 
-    async def close(self) -> None:
-        await self._openai_model.close()
+    @property
+    def usage(self) -> PromptUsage:
+        return self._openai_model.usage
 
     async def predict(self, *, messages: ChatHistory) -> ChatMessage:
         return await self._get_model().predict(messages=messages)
 
+    async def predict_structured(
+        self, *, messages: ChatHistory, name: str, json_schema: dict[str, Any]
+    ) -> ChatMessage:
+        return await self._get_model().predict_structured(
+            messages=messages, name=name, json_schema=json_schema
+        )
+
+    async def predict_stream(self, *, messages: ChatHistory) -> AsyncGenerator[ChatMessage]:
+        async with aclosing(self._get_model().predict_stream(messages=messages)) as stream:
+            async for delta in stream:
+                yield delta
+
     def _get_model(self, backend: ChatModelBackend | None = None, /) -> ChatModelABC:
         if backend is None:
             backend = self.config.backend
@@ -1,5 +1,9 @@
 from pydantic.dataclasses import dataclass
 
+from ...cache import CacheConfig
+from ...limiter import LimiterConfig
+from ...pool import PoolConfig
+
 
 @dataclass(frozen=True, kw_only=True)
 class OpenAIChatModelConfig:
@@ -7,3 +11,6 @@ class OpenAIChatModelConfig:
     api_key: str
     base_url: str
     proxy: str
+    pool_config: PoolConfig = PoolConfig()
+    limiter_config: LimiterConfig = LimiterConfig(max_concurrency=96)
+    cache_config: CacheConfig = CacheConfig()
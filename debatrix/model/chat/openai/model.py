@@ -1,9 +1,17 @@
-from asyncio import Semaphore
+from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
+from json import dumps
 from logging import WARNING, Logger, getLogger
+from typing import Any
 
-from httpx import AsyncClient
-from openai import AsyncOpenAI, BadRequestError
-from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
+from openai import NOT_GIVEN, AsyncOpenAI, AsyncStream, BadRequestError
+from openai.types import CompletionUsage
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessageParam,
+    completion_create_params,
+)
 from tenacity import (
     AsyncRetrying,
     before_sleep_log,
@@ -13,18 +21,30 @@ from tenacity import (
 )
 
 from ....util import sanitize
-from ...common import ChatHistory, ChatMessage, ChatRole
+from ...cache import CacheHub, ModelCache
+from ...common import ChatHistory, ChatMessage, ChatRole, PromptUsage
+from ...limiter import LimiterHub, RateLimiter
+from ...pool import ClientPool
 from ..base import ChatModelABC
 from .config import OpenAIChatModelConfig
 
 
 class OpenAIChatModel(ChatModelABC):
-    def __init__(self) -> None:
-        self._semaphore = Semaphore(value=8)
+    SEED: int = 19260817
+    TEMPERATURE: float = 0.0
+
+    def __init__(
+        self, *, cache_hub: CacheHub, limiter_hub: LimiterHub, client_pool: ClientPool
+    ) -> None:
         self._logger: Logger = getLogger(__name__)
 
+        self._cache_hub = cache_hub
+        self._cache: ModelCache | None = None
+        self._limiter_hub = limiter_hub
+        self._client_pool = client_pool
+
         self._client_info_updated: bool = False
-        self._opening_client: AsyncOpenAI | None = None
+        self._usage = PromptUsage()
 
     @property
     def config(self) -> OpenAIChatModelConfig:
@@ -34,15 +54,51 @@ class OpenAIChatModel(ChatModelABC):
     def config(self, config: OpenAIChatModelConfig) -> None:
         self._config = config
         self._client_info_updated = True
+        self._cache = self._cache_hub.get(config.cache_config, name="chat")
 
-    async def close(self) -> None:
-        if self._opening_client is not None:
-            await self._opening_client.close()
+        self._limiter: RateLimiter = self._limiter_hub.get(
+            config.limiter_config,
+            base_url=config.base_url,
+            api_key=config.api_key,
+            model=config.model,
+        )
+
+    @property
+    def usage(self) -> PromptUsage:
+        return self._usage
 
     async def predict(self, *, messages: ChatHistory) -> ChatMessage:
+        return await self._predict(messages)
+
+    async def predict_structured(
+        self, *, messages: ChatHistory, name: str, json_schema: dict[str, Any]
+    ) -> ChatMessage:
+        return await self._predict(
+            messages,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": name,
+                    "schema": self._make_strict_schema(json_schema),
+                    "strict": True,
+                },
+            },
+        )
+
+    async def predict_stream(self, *, messages: ChatHistory) -> AsyncGenerator[ChatMessage]:
+        prepared: list[ChatCompletionMessageParam] = self._prepare_messages(messages)
+        cache_key: str = self._get_cache_key(prepared)
+
+        if self._cache is not None:
+            cached: bytes | None = await self._cache.get(cache_key)
+            if cached is not None:
+                yield ChatMessage(role=ChatRole.AI, content=cached.decode())
+                return
+
         client: AsyncOpenAI = await self._get_client()
+        estimated: int = RateLimiter.estimate_tokens(*(message.content for message in messages))
 
-        async with self._semaphore:
+        async with AsyncExitStack() as stack:
             async for attempt in AsyncRetrying(
                 stop=stop_after_attempt(3),
                 wait=wait_random_exponential(min=4, max=60),
@@ -50,43 +106,165 @@ class OpenAIChatModel(ChatModelABC):
                 before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
             ):
                 with attempt:
+                    async with AsyncExitStack() as attempt_stack:
+                        await attempt_stack.enter_async_context(
+                            self._limiter.limit(tokens=estimated)
+                        )
+
+                        stream: AsyncStream[ChatCompletionChunk] = (
+                            await client.chat.completions.create(
+                                messages=prepared,
+                                model=self.config.model,
+                                seed=self.SEED,
+                                temperature=self.TEMPERATURE,
+                                stream=True,
+                                stream_options={"include_usage": True},
+                            )
+                        )
+
+                        stack.push_async_exit(attempt_stack.pop_all())
+
+            content: str = ""
+            stop_reason: str | None = None
+
+            async with stream:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        self._record_usage(chunk.usage, estimated=estimated)
+
+                    if len(chunk.choices) == 0:
+                        continue
+
+                    stop_reason = sanitize(chunk.choices[0].finish_reason, stop_reason)
+                    delta: str | None = chunk.choices[0].delta.content
+
+                    if delta is not None and delta != "":
+                        content += delta
+                        yield ChatMessage(role=ChatRole.AI, content=delta)
+
+        if stop_reason != "stop":
+            raise RuntimeError(f"response doesn't stop properly: {stop_reason}")
+
+        if self._cache is not None:
+            await self._cache.put(cache_key, content.encode())
+
+    async def _predict(
+        self,
+        messages: ChatHistory,
+        /,
+        *,
+        response_format: completion_create_params.ResponseFormat | None = None,
+    ) -> ChatMessage:
+        prepared: list[ChatCompletionMessageParam] = self._prepare_messages(messages)
+        cache_key: str = self._get_cache_key(prepared, response_format=response_format)
+
+        if self._cache is not None:
+            cached: bytes | None = await self._cache.get(cache_key)
+            if cached is not None:
+                return ChatMessage(role=ChatRole.AI, content=cached.decode())
+
+        client: AsyncOpenAI = await self._get_client()
+        estimated: int = RateLimiter.estimate_tokens(*(message.content for message in messages))
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_random_exponential(min=4, max=60),
+            retry=retry_if_not_exception_type((RuntimeError, BadRequestError)),
+            before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+        ):
+            with attempt:
+                async with self._limiter.limit(tokens=estimated):
                     completion: ChatCompletion = await client.chat.completions.create(
-                        messages=self._prepare_messages(messages),
+                        messages=prepared,
                         model=self.config.model,
-                        seed=19260817,
-                        temperature=0.0,
+                        seed=self.SEED,
+                        temperature=self.TEMPERATURE,
+                        response_format=sanitize(response_format, NOT_GIVEN),
                     )
 
-                    stop_reason: str = completion.choices[0].finish_reason
-                    if stop_reason != "stop":
-                        raise RuntimeError(f"response doesn't stop properly: {stop_reason}")
+                if completion.usage is not None:
+                    self._record_usage(completion.usage, estimated=estimated)
 
-                    return ChatMessage(
-                        role=ChatRole.AI,
-                        content=sanitize(completion.choices[0].message.content, ""),
-                    )
+                stop_reason: str = completion.choices[0].finish_reason
+                if stop_reason != "stop":
+                    raise RuntimeError(f"response doesn't stop properly: {stop_reason}")
+
+                refusal: str | None = completion.choices[0].message.refusal
+                if refusal is not None:
+                    raise RuntimeError(f"response refused: {refusal}")
+
+                content: str = sanitize(completion.choices[0].message.content, "")
+
+                if self._cache is not None:
+                    await self._cache.put(cache_key, content.encode())
+
+                return ChatMessage(role=ChatRole.AI, content=content)
 
         raise RuntimeError("predict direct result not received")
 
     async def _get_client(self) -> AsyncOpenAI:
         if self._client_info_updated:
-            await self.close()
-
-            proxy: str | None = self.config.proxy
-            if proxy == "":
-                proxy = None
-
             self._client = AsyncOpenAI(
                 api_key=self.config.api_key,
                 base_url=self.config.base_url,
-                http_client=AsyncClient(proxies=proxy),
+                http_client=self._client_pool.get(
+                    self.config.pool_config, base_url=self.config.base_url, proxy=self.config.proxy
+                ),
             )
 
             self._client_info_updated = False
-            self._opening_client = self._client
 
         return self._client
 
+    def _record_usage(self, usage: CompletionUsage, /, *, estimated: int) -> None:
+        self._limiter.reconcile(estimated=estimated, actual=usage.total_tokens)
+
+        self._usage.requests += 1
+        self._usage.prompt_tokens += usage.prompt_tokens
+        self._usage.completion_tokens += usage.completion_tokens
+
+        if usage.prompt_tokens_details is not None:
+            self._usage.cached_tokens += sanitize(usage.prompt_tokens_details.cached_tokens, 0)
+
+    def _get_cache_key(
+        self,
+        prepared: list[ChatCompletionMessageParam],
+        /,
+        *,
+        response_format: completion_create_params.ResponseFormat | None = None,
+    ) -> str:
+        parts: list[str] = [
+            "chat",
+            self.config.base_url,
+            self.config.model,
+            str(self.SEED),
+            str(self.TEMPERATURE),
+            dumps(prepared, ensure_ascii=False, separators=(",", ":")),
+        ]
+
+        if response_format is not None:
+            parts.append(dumps(response_format, ensure_ascii=False, separators=(",", ":")))
+
+        return ModelCache.make_key(*parts)
+
+    @classmethod
+    def _make_strict_schema(cls, schema: Any, /) -> Any:
+        if isinstance(schema, list):
+            return [cls._make_strict_schema(item) for item in schema]
+
+        if not isinstance(schema, dict):
+            return schema
+
+        strict: dict[str, Any] = {
+            key: cls._make_strict_schema(value) for key, value in schema.items()
+        }
+
+        if strict.get("type") == "object":
+            strict["additionalProperties"] = False
+            strict["required"] = list(strict.get("properties", {}).keys())
+
+        return strict
+
     @staticmethod
     def _prepare_messages(messages: ChatHistory, /) -> list[ChatCompletionMessageParam]:
         prepared: list[ChatCompletionMessageParam] = []
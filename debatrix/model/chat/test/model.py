@@ -1,7 +1,9 @@
 import re
 from asyncio import sleep
+from collections.abc import AsyncGenerator
 from json import dumps
 from random import Random
+from typing import Any
 
 from ..base import ChatModelABC
 from ...common import ChatHistory, ChatMessage, ChatRole
@@ -35,6 +37,26 @@ class TestChatModel(ChatModelABC):
         await sleep(self.config.predict_delay)
         return ChatMessage(role=ChatRole.AI, content=self._respond(messages=messages))
 
+    async def predict_structured(
+        self, *, messages: ChatHistory, name: str, json_schema: dict[str, Any]
+    ) -> ChatMessage:
+        await sleep(self.config.predict_delay)
+
+        return ChatMessage(
+            role=ChatRole.AI,
+            content=self._respond(
+                messages=ChatHistory(
+                    root=(*messages, ChatMessage(role=ChatRole.SYSTEM, content=dumps(json_schema)))
+                )
+            ),
+        )
+
+    async def predict_stream(self, *, messages: ChatHistory) -> AsyncGenerator[ChatMessage]:
+        await sleep(self.config.predict_delay)
+
+        for match in re.finditer(r"\S+\s*|\s+", self._respond(messages=messages)):
+            yield ChatMessage(role=ChatRole.AI, content=match.group())
+
     def _respond(self, *, messages: ChatHistory) -> str:
         concat_messages: str = ("\n\n" + "-" * 16 + "\n\n").join(
             f"{message.role}:\n\n{message.content}" for message in messages
@@ -65,7 +87,17 @@ class TestChatModel(ChatModelABC):
             print(f"cannot_fix:\n\n{concat_messages}")
             raise RuntimeError(f"cannot_fix: {concat_messages}")
 
-        if has("Score for Specific Debater"):
+        if has("Full Verdict of Debate"):
+            return dumps(
+                {
+                    "debaters": [
+                        {"debater_name": debater, "judgment": ipsum(), "score": gen.randint(1, 10)}
+                        for debater in debaters
+                    ],
+                    "winner": gen.choice(debaters + ["It's a tie!"]),
+                }
+            )
+        elif has("Score for Specific Debater"):
             return dumps({"score": gen.randint(1, 10)})
         elif has("Judgment and Score for Specific Debater"):
             return dumps({"judgment": ipsum(), "score": gen.randint(1, 10)})
@@ -1,9 +1,12 @@
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from types import NoneType
+from typing import Any
 from urllib.parse import quote
 
+import numpy as np
+
 from ..api import APIClient
-from .common import ChatHistory, ChatMessage
+from .common import ChatHistory, ChatMessage, PackedEmbeddings, StructuredChatRequest
 from .config import ModelConfig
 
 
@@ -28,6 +31,26 @@ class ModelClient(APIClient):
 
         return result
 
+    async def chat_structured(
+        self, *, messages: ChatHistory, name: str, json_schema: dict[str, Any]
+    ) -> ChatMessage:
+        result: ChatMessage | None = await self.query(
+            self._quote("/chat/structured"),
+            StructuredChatRequest(messages=messages, name=name, json_schema=json_schema),
+            output_type=ChatMessage,
+        )
+
+        if result is None:
+            raise RuntimeError("structured predict result is null")
+
+        return result
+
+    async def chat_stream(self, *, messages: ChatHistory) -> AsyncIterator[ChatMessage]:
+        async for delta in self.query_stream(
+            self._quote("/chat/stream"), messages, output_type=ChatMessage
+        ):
+            yield delta
+
     async def embed_one(self, *, text: str) -> list[float]:
         result: list[float] | None = await self.query(
             self._quote("/embed/one"), text, output_type=list[float]
@@ -48,5 +71,21 @@ class ModelClient(APIClient):
 
         return result
 
+    async def embed_one_array(self, *, text: str) -> np.ndarray:
+        return await self._query_packed("/embed/one/packed", text)
+
+    async def embed_many_array(self, *, batch: Iterable[str]) -> np.ndarray:
+        return await self._query_packed("/embed/many/packed", list(batch))
+
+    async def _query_packed(self, path: str, data: Any, /) -> np.ndarray:
+        result: PackedEmbeddings | None = await self.query(
+            self._quote(path), data, output_type=PackedEmbeddings
+        )
+
+        if result is None:
+            raise RuntimeError("embed result is null")
+
+        return result.unpack()
+
     def _quote(self, path: str) -> str:
         return quote(f"/{self._session_id}{path}")
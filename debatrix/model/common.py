@@ -1,8 +1,10 @@
 import enum
-from typing import overload
+from base64 import b64decode, b64encode
+from typing import Any, overload
 from collections.abc import Iterator
 
-from pydantic import RootModel
+import numpy as np
+from pydantic import RootModel, computed_field
 from pydantic.dataclasses import dataclass
 
 
@@ -45,3 +47,37 @@ class ChatHistory(RootModel[tuple[ChatMessage, ...]]):
             return ChatHistory(root=self.root[index])
         else:
             return self.root[index]
+
+
+@dataclass(kw_only=True)
+class PromptUsage:
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+
+    @computed_field
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens > 0 else 0.0
+
+
+@dataclass(frozen=True, kw_only=True)
+class StructuredChatRequest:
+    messages: ChatHistory
+    name: str
+    json_schema: dict[str, Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class PackedEmbeddings:
+    shape: tuple[int, ...]
+    data: str
+
+    @classmethod
+    def pack(cls, embeddings: list[float] | list[list[float]], /) -> "PackedEmbeddings":
+        array: np.ndarray = np.asarray(embeddings, dtype="<f4")
+        return cls(shape=array.shape, data=b64encode(array.tobytes()).decode("ascii"))
+
+    def unpack(self) -> np.ndarray:
+        return np.frombuffer(b64decode(self.data), dtype="<f4").reshape(self.shape)
@@ -1,4 +1,5 @@
+from .batcher import EmbedBatcherHub
 from .config import EmbedModelBackend, EmbedModelConfig
 from .model import EmbedModel
 
-__all__ = ["EmbedModelBackend", "EmbedModelConfig", "EmbedModel"]
+__all__ = ["EmbedBatcherHub", "EmbedModelBackend", "EmbedModelConfig", "EmbedModel"]
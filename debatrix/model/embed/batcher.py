@@ -0,0 +1,87 @@
+from asyncio import Event, Task, TaskGroup, create_task, shield, timeout
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+
+from pydantic.dataclasses import dataclass
+
+EmbedFunc = Callable[[list[str]], Coroutine[Any, Any, list[list[float]]]]
+
+
+@dataclass(frozen=True, kw_only=True)
+class EmbedBatchConfig:
+    window: float = 0.01
+    max_batch_size: int = 2048
+
+
+class EmbedBatcher:
+    def __init__(self, *, func: EmbedFunc, config: EmbedBatchConfig) -> None:
+        self._func = func
+        self._config = config
+
+        self._round: tuple[list[str], Event, Task[list[list[float]]]] | None = None
+        self._flushing: set[Task[list[list[float]]]] = set()
+
+    @property
+    def config(self) -> EmbedBatchConfig:
+        return self._config
+
+    @config.setter
+    def config(self, config: EmbedBatchConfig) -> None:
+        self._config = config
+
+    async def embed_many(self, batch: list[str], /) -> list[list[float]]:
+        if len(batch) == 0:
+            return []
+
+        if self._round is None:
+            texts: list[str] = []
+            full = Event()
+            task: Task[list[list[float]]] = create_task(self._flush(texts, full))
+            self._flushing.add(task)
+            task.add_done_callback(self._flushing.discard)
+            self._round = (texts, full, task)
+
+        texts, full, task = self._round
+        offset: int = len(texts)
+        texts.extend(batch)
+
+        if len(texts) >= self.config.max_batch_size:
+            full.set()
+            self._round = None
+
+        embeddings: list[list[float]] = await shield(task)
+        return embeddings[offset : offset + len(batch)]
+
+    async def _flush(self, texts: list[str], full: Event, /) -> list[list[float]]:
+        try:
+            async with timeout(self.config.window):
+                await full.wait()
+        except TimeoutError:
+            pass
+
+        if self._round is not None and self._round[0] is texts:
+            self._round = None
+
+        size: int = self.config.max_batch_size
+
+        async with TaskGroup() as tg:
+            tasks: list[Task[list[list[float]]]] = [
+                tg.create_task(self._func(texts[i : i + size])) for i in range(0, len(texts), size)
+            ]
+
+        return [embedding for task in tasks for embedding in task.result()]
+
+
+class EmbedBatcherHub:
+    def __init__(self) -> None:
+        self._batchers: dict[Hashable, EmbedBatcher] = {}
+
+    def get(
+        self, config: EmbedBatchConfig, /, *, key: Hashable, make_func: Callable[[], EmbedFunc]
+    ) -> EmbedBatcher:
+        if key in self._batchers:
+            self._batchers[key].config = config
+        else:
+            self._batchers[key] = EmbedBatcher(func=make_func(), config=config)
+
+        return self._batchers[key]
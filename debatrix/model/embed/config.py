@@ -2,6 +2,8 @@ import enum
 
 from pydantic.dataclasses import dataclass
 
+from ..cache import CacheConfig
+from .batcher import EmbedBatchConfig
 from .openai import OpenAIEmbedModelConfig
 
 
@@ -15,3 +17,5 @@ class EmbedModelBackend(enum.StrEnum):
 class EmbedModelConfig:
     backend: EmbedModelBackend
     openai_config: OpenAIEmbedModelConfig
+    cache_config: CacheConfig = CacheConfig()
+    batch_config: EmbedBatchConfig = EmbedBatchConfig()
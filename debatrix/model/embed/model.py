@@ -1,13 +1,33 @@
+from collections.abc import Hashable
+
+import numpy as np
+
+from ..cache import CacheHub, ModelCache
+from ..limiter import LimiterHub
+from ..pool import ClientPool
 from .base import EmbedModelABC
+from .batcher import EmbedBatcher, EmbedBatcherHub, EmbedFunc
 from .config import EmbedModelBackend, EmbedModelConfig
 from .openai import OpenAIEmbedModel
 from .test import TestEmbedModel
 
 
 class EmbedModel(EmbedModelABC):
-    def __init__(self) -> None:
-        self._test_model = TestEmbedModel()
-        self._openai_model = OpenAIEmbedModel()
+    def __init__(
+        self,
+        *,
+        cache_hub: CacheHub,
+        limiter_hub: LimiterHub,
+        client_pool: ClientPool,
+        batcher_hub: EmbedBatcherHub,
+    ) -> None:
+        self._limiter_hub = limiter_hub
+        self._client_pool = client_pool
+
+        self._cache_hub = cache_hub
+        self._cache: ModelCache | None = None
+
+        self._batcher_hub = batcher_hub
 
     @property
     def config(self) -> EmbedModelConfig:
@@ -16,24 +36,89 @@ class EmbedModel(EmbedModelABC):
     @config.setter
     def config(self, config: EmbedModelConfig) -> None:
         self._config = config
-        self._openai_model.config = config.openai_config
+        self._cache = self._cache_hub.get(config.cache_config, name="embed")
 
-    async def close(self) -> None:
-        await self._openai_model.close()
+        self._batcher: EmbedBatcher = self._batcher_hub.get(
+            config.batch_config, key=self._get_batcher_key(), make_func=self._make_embed_func
+        )
 
     async def embed_one(self, *, text: str) -> list[float]:
-        return await self._get_model().embed_one(text=text)
+        return (await self.embed_many(batch=[text]))[0]
 
     async def embed_many(self, *, batch: list[str]) -> list[list[float]]:
-        return await self._get_model().embed_many(batch=batch)
+        if self._cache is None:
+            return await self._batcher.embed_many(batch)
+
+        keys: list[str] = [self._get_cache_key(text) for text in batch]
+        result: list[list[float] | None] = [None] * len(batch)
+        missing: list[int] = []
+
+        for i, value in enumerate(await self._cache.get_many(keys)):
+            if value is None:
+                missing.append(i)
+            else:
+                result[i] = np.frombuffer(value, dtype="<f4").tolist()
+
+        if len(missing) > 0:
+            embeddings: list[list[float]] = await self._batcher.embed_many(
+                [batch[i] for i in missing]
+            )
+
+            if len(embeddings) != len(missing):
+                raise RuntimeError(f"expected {len(missing)} embeddings, got {len(embeddings)}")
+
+            await self._cache.put_many(
+                [
+                    (keys[i], np.asarray(embedding, dtype="<f4").tobytes())
+                    for i, embedding in zip(missing, embeddings)
+                ]
+            )
+
+            for i, embedding in zip(missing, embeddings):
+                result[i] = embedding
 
-    def _get_model(self, backend: EmbedModelBackend | None = None, /) -> EmbedModelABC:
-        if backend is None:
-            backend = self.config.backend
+        filled: list[list[float]] = [embedding for embedding in result if embedding is not None]
+        if len(filled) != len(batch):
+            raise RuntimeError(f"expected {len(batch)} embeddings, got {len(filled)}")
+
+        return filled
+
+    def _get_cache_key(self, text: str, /) -> str:
+        backend: EmbedModelBackend = self.config.backend
+
+        if backend == EmbedModelBackend.OPENAI:
+            return ModelCache.make_key(
+                "embed",
+                backend,
+                self.config.openai_config.base_url,
+                self.config.openai_config.model,
+                text,
+            )
+        else:
+            return ModelCache.make_key("embed", backend, "", "", text)
+
+    def _get_batcher_key(self) -> Hashable:
+        backend: EmbedModelBackend = self.config.backend
+
+        if backend == EmbedModelBackend.OPENAI:
+            return backend, self.config.openai_config
+        else:
+            return (backend,)
+
+    def _make_embed_func(self) -> EmbedFunc:
+        backend: EmbedModelBackend = self.config.backend
+        model: EmbedModelABC
 
         if backend == EmbedModelBackend.TEST:
-            return self._test_model
+            model = TestEmbedModel()
         elif backend == EmbedModelBackend.OPENAI:
-            return self._openai_model
+            openai_model = OpenAIEmbedModel(
+                limiter_hub=self._limiter_hub, client_pool=self._client_pool
+            )
+
+            openai_model.config = self.config.openai_config
+            model = openai_model
         else:
             raise ValueError(backend)
+
+        return lambda batch: model.embed_many(batch=batch)
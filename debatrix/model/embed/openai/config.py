@@ -1,5 +1,8 @@
 from pydantic.dataclasses import dataclass
 
+from ...limiter import LimiterConfig
+from ...pool import PoolConfig
+
 
 @dataclass(frozen=True, kw_only=True)
 class OpenAIEmbedModelConfig:
@@ -7,3 +10,5 @@ class OpenAIEmbedModelConfig:
     api_key: str
     base_url: str
     proxy: str
+    pool_config: PoolConfig = PoolConfig()
+    limiter_config: LimiterConfig = LimiterConfig(max_concurrency=256)
@@ -1,7 +1,5 @@
-from asyncio import Semaphore
 from logging import WARNING, Logger, getLogger
 
-from httpx import AsyncClient
 from openai import AsyncOpenAI, BadRequestError
 from openai.types.create_embedding_response import CreateEmbeddingResponse
 from tenacity import (
@@ -12,17 +10,19 @@ from tenacity import (
     wait_random_exponential,
 )
 
+from ...limiter import LimiterHub, RateLimiter
+from ...pool import ClientPool
 from ..base import EmbedModelABC
 from .config import OpenAIEmbedModelConfig
 
 
 class OpenAIEmbedModel(EmbedModelABC):
-    def __init__(self) -> None:
-        self._semaphore = Semaphore(value=256)
+    def __init__(self, *, limiter_hub: LimiterHub, client_pool: ClientPool) -> None:
         self._logger: Logger = getLogger(__name__)
+        self._limiter_hub = limiter_hub
+        self._client_pool = client_pool
 
         self._client_info_updated: bool = False
-        self._opening_client: AsyncOpenAI | None = None
 
     @property
     def config(self) -> OpenAIEmbedModelConfig:
@@ -33,26 +33,32 @@ class OpenAIEmbedModel(EmbedModelABC):
         self._config = config
         self._client_info_updated = True
 
-    async def close(self) -> None:
-        if self._opening_client is not None:
-            await self._opening_client.close()
+        self._limiter: RateLimiter = self._limiter_hub.get(
+            config.limiter_config,
+            base_url=config.base_url,
+            api_key=config.api_key,
+            model=config.model,
+        )
 
     async def embed_one(self, *, text: str) -> list[float]:
         client: AsyncOpenAI = await self._get_client()
 
-        async with self._semaphore:
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(3),
-                wait=wait_random_exponential(min=4, max=60),
-                retry=retry_if_not_exception_type((RuntimeError, BadRequestError)),
-                before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
-            ):
-                with attempt:
+        estimated: int = RateLimiter.estimate_tokens(text)
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_random_exponential(min=4, max=60),
+            retry=retry_if_not_exception_type((RuntimeError, BadRequestError)),
+            before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+        ):
+            with attempt:
+                async with self._limiter.limit(tokens=estimated):
                     response: CreateEmbeddingResponse = await client.embeddings.create(
                         input=text, model=self.config.model
                     )
 
-                    return response.data[0].embedding
+                self._limiter.reconcile(estimated=estimated, actual=response.usage.total_tokens)
+                return response.data[0].embedding
 
         raise RuntimeError("embed one result not received")
 
@@ -62,37 +68,35 @@ class OpenAIEmbedModel(EmbedModelABC):
 
         client: AsyncOpenAI = await self._get_client()
 
-        async with self._semaphore:
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(3),
-                wait=wait_random_exponential(min=4, max=60),
-                retry=retry_if_not_exception_type((RuntimeError, BadRequestError)),
-                before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
-            ):
-                with attempt:
+        estimated: int = RateLimiter.estimate_tokens(*batch)
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_random_exponential(min=4, max=60),
+            retry=retry_if_not_exception_type((RuntimeError, BadRequestError)),
+            before_sleep=before_sleep_log(self._logger, log_level=WARNING, exc_info=True),
+        ):
+            with attempt:
+                async with self._limiter.limit(tokens=estimated):
                     response: CreateEmbeddingResponse = await client.embeddings.create(
                         input=batch, model=self.config.model
                     )
 
-                    return [item.embedding for item in response.data]
+                self._limiter.reconcile(estimated=estimated, actual=response.usage.total_tokens)
+                return [item.embedding for item in response.data]
 
         raise RuntimeError("embed many result not received")
 
     async def _get_client(self) -> AsyncOpenAI:
         if self._client_info_updated:
-            await self.close()
-
-            proxy: str | None = self.config.proxy
-            if proxy == "":
-                proxy = None
-
             self._client = AsyncOpenAI(
                 api_key=self.config.api_key,
                 base_url=self.config.base_url,
-                http_client=AsyncClient(proxies=proxy),
+                http_client=self._client_pool.get(
+                    self.config.pool_config, base_url=self.config.base_url, proxy=self.config.proxy
+                ),
             )
 
             self._client_info_updated = False
-            self._opening_client = self._client
 
         return self._client
@@ -4,9 +4,9 @@ from ..base import EmbedModelABC
 
 
 class TestEmbedModel(EmbedModelABC):
-    async def embed_one(self, *text: str) -> list[float]:
+    async def embed_one(self, *, text: str) -> list[float]:
         gen = Random(x=hash(text))
         return [gen.random() - 0.5 for _ in range(1536)]
 
     async def embed_many(self, *, batch: list[str]) -> list[list[float]]:
-        return [await self.embed_one(text) for text in batch]
+        return [await self.embed_one(text=text) for text in batch]
@@ -0,0 +1,114 @@
+from asyncio import Condition, Lock, sleep
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from pydantic.dataclasses import dataclass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LimiterConfig:
+    max_concurrency: int
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+class TokenBucket:
+    def __init__(self, *, per_minute: int) -> None:
+        self._per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated: float = monotonic()
+        self._lock = Lock()
+
+    @property
+    def per_minute(self) -> int:
+        return self._per_minute
+
+    @per_minute.setter
+    def per_minute(self, per_minute: int) -> None:
+        self._refill()
+        self._per_minute = per_minute
+        self._tokens = min(self._tokens, per_minute)
+
+    async def acquire(self, amount: float, /) -> None:
+        async with self._lock:
+            while self._per_minute > 0:
+                self._refill()
+                amount = min(amount, self._per_minute)
+
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    break
+
+                await sleep((amount - self._tokens) * 60 / self._per_minute)
+
+    def adjust(self, amount: float, /) -> None:
+        if self._per_minute > 0:
+            self._refill()
+            self._tokens = min(self._tokens - amount, self._per_minute)
+
+    def _refill(self) -> None:
+        now: float = monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self._per_minute / 60, self._per_minute
+        )
+        self._updated = now
+
+
+class RateLimiter:
+    def __init__(self, *, config: LimiterConfig) -> None:
+        self._running: int = 0
+        self._condition = Condition()
+
+        self._request_bucket = TokenBucket(per_minute=config.requests_per_minute)
+        self._token_bucket = TokenBucket(per_minute=config.tokens_per_minute)
+        self.config = config
+
+    @property
+    def config(self) -> LimiterConfig:
+        return self._config
+
+    @config.setter
+    def config(self, config: LimiterConfig) -> None:
+        self._config = config
+        self._request_bucket.per_minute = config.requests_per_minute
+        self._token_bucket.per_minute = config.tokens_per_minute
+
+    @asynccontextmanager
+    async def limit(self, *, tokens: int) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._running < self._config.max_concurrency)
+            self._running += 1
+
+        try:
+            await self._request_bucket.acquire(1)
+            await self._token_bucket.acquire(tokens)
+            yield
+        finally:
+            async with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+    def reconcile(self, *, estimated: int, actual: int) -> None:
+        self._token_bucket.adjust(actual - estimated)
+
+    @staticmethod
+    def estimate_tokens(*texts: str) -> int:
+        return sum(len(text) for text in texts) // 4 + 1
+
+
+class LimiterHub:
+    def __init__(self) -> None:
+        self._limiters: dict[tuple[str, str, str], RateLimiter] = {}
+
+    def get(
+        self, config: LimiterConfig, /, *, base_url: str, api_key: str, model: str
+    ) -> RateLimiter:
+        key: tuple[str, str, str] = (base_url, api_key, model)
+
+        if key in self._limiters:
+            self._limiters[key].config = config
+        else:
+            self._limiters[key] = RateLimiter(config=config)
+
+        return self._limiters[key]
@@ -0,0 +1,50 @@
+from asyncio import TaskGroup
+from importlib.util import find_spec
+
+from httpx import AsyncClient, Limits
+from pydantic import field_validator
+from pydantic.dataclasses import dataclass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PoolConfig:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30
+    http2: bool = False
+
+    @field_validator("http2")
+    @classmethod
+    def http2_available(cls, http2: bool) -> bool:
+        if http2 and find_spec("h2") is None:
+            raise ValueError("http2 requires the h2 package, install debatrix[http2]")
+
+        return http2
+
+
+class ClientPool:
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, str, PoolConfig], AsyncClient] = {}
+
+    def get(self, config: PoolConfig, /, *, base_url: str, proxy: str) -> AsyncClient:
+        key: tuple[str, str, PoolConfig] = (base_url, proxy, config)
+
+        if key not in self._clients:
+            self._clients[key] = AsyncClient(
+                proxy=None if proxy == "" else proxy,
+                limits=Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+                http2=config.http2,
+            )
+
+        return self._clients[key]
+
+    async def close(self) -> None:
+        async with TaskGroup() as tg:
+            for client in self._clients.values():
+                tg.create_task(client.aclose())
+
+        self._clients.clear()
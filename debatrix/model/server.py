@@ -1,49 +1,109 @@
-from asyncio import TaskGroup
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 from typing import Annotated
 
 from fastapi import Body
 
 from ..api import APIServer
+from .cache import CacheHub, CacheStats
 from .chat import ChatModel
-from .common import ChatHistory, ChatMessage
+from .common import (
+    ChatHistory,
+    ChatMessage,
+    PackedEmbeddings,
+    PromptUsage,
+    StructuredChatRequest,
+)
 from .config import ModelConfig
-from .embed import EmbedModel
+from .embed import EmbedBatcherHub, EmbedModel
+from .limiter import LimiterHub
+from .pool import ClientPool
 
 
 class ModelServer(APIServer):
     def __init__(self) -> None:
         super().__init__()
         self._models: dict[str, tuple[ChatModel, EmbedModel]] = {}
+        self._cache_hub = CacheHub()
+        self._limiter_hub = LimiterHub()
+        self._client_pool = ClientPool()
+        self._batcher_hub = EmbedBatcherHub()
 
     def init_app(self, /, *, debug: bool = False):
         super().init_app(debug=debug)
+        self.app.get("/cache/stats", response_model=dict[str, CacheStats])(self._cache_stats)
+        self.app.get("/chat/usage", response_model=dict[str, PromptUsage])(self._chat_usage)
 
         self.assign("/{session_id}/create", self._create)
         self.assign("/{session_id}/configure", self._configure)
 
         self.assign("/{session_id}/chat/predict", self._chat_predict)
+        self.assign("/{session_id}/chat/structured", self._chat_structured)
+        self.assign_stream("/{session_id}/chat/stream", self._chat_stream)
 
         self.assign("/{session_id}/embed/one", self._embed_one)
         self.assign("/{session_id}/embed/many", self._embed_many)
+        self.assign("/{session_id}/embed/one/packed", self._embed_one_packed)
+        self.assign("/{session_id}/embed/many/packed", self._embed_many_packed)
 
     async def close(self) -> None:
-        async with TaskGroup() as tg:
-            for chat_model, embed_model in self._models.values():
-                tg.create_task(chat_model.close())
-                tg.create_task(embed_model.close())
+        await self._client_pool.close()
+        await self._cache_hub.close()
 
     async def _create(self, session_id: str) -> None:
-        self._models[session_id] = (ChatModel(), EmbedModel())
+        self._models[session_id] = (
+            ChatModel(
+                cache_hub=self._cache_hub,
+                limiter_hub=self._limiter_hub,
+                client_pool=self._client_pool,
+            ),
+            EmbedModel(
+                cache_hub=self._cache_hub,
+                limiter_hub=self._limiter_hub,
+                client_pool=self._client_pool,
+                batcher_hub=self._batcher_hub,
+            ),
+        )
 
     async def _configure(self, session_id: str, config: ModelConfig) -> None:
         self._models[session_id][0].config = config.chat_config
         self._models[session_id][1].config = config.embed_config
 
+    async def _cache_stats(self) -> dict[str, CacheStats]:
+        return self._cache_hub.stats
+
+    async def _chat_usage(self) -> dict[str, PromptUsage]:
+        return {session_id: models[0].usage for session_id, models in self._models.items()}
+
     async def _chat_predict(self, session_id: str, messages: ChatHistory) -> ChatMessage:
         return await self._models[session_id][0].predict(messages=messages)
 
+    async def _chat_structured(
+        self, session_id: str, request: StructuredChatRequest
+    ) -> ChatMessage:
+        return await self._models[session_id][0].predict_structured(
+            messages=request.messages, name=request.name, json_schema=request.json_schema
+        )
+
+    async def _chat_stream(
+        self, session_id: str, messages: ChatHistory
+    ) -> AsyncGenerator[ChatMessage]:
+        async with aclosing(
+            self._models[session_id][0].predict_stream(messages=messages)
+        ) as stream:
+            async for delta in stream:
+                yield delta
+
     async def _embed_one(self, session_id: str, text: Annotated[str, Body()]) -> list[float]:
         return await self._models[session_id][1].embed_one(text=text)
 
     async def _embed_many(self, session_id: str, batch: list[str]) -> list[list[float]]:
         return await self._models[session_id][1].embed_many(batch=batch)
+
+    async def _embed_one_packed(
+        self, session_id: str, text: Annotated[str, Body()]
+    ) -> PackedEmbeddings:
+        return PackedEmbeddings.pack(await self._embed_one(session_id, text))
+
+    async def _embed_many_packed(self, session_id: str, batch: list[str]) -> PackedEmbeddings:
+        return PackedEmbeddings.pack(await self._embed_many(session_id, batch))
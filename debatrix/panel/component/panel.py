@@ -1,3 +1,4 @@
+from asyncio import TaskGroup
 from collections.abc import Iterable
 from dataclasses import InitVar, dataclass
 from typing import Any, Self, TypeVar
@@ -7,6 +8,7 @@ from ...core.action import AllPanelActions, JudgeAction, PanelAction
 from ...core.common import DimensionInfo, DimensionName, DimensionalVerdict, Verdict, Speech
 from ...core.component import BaseJudge, BasePanel
 from ..interface import PanelInterfaceClient
+from ..interface.common import TurnKeeper
 from .base import HasInterfaceObject
 from .common import Stage, TaskCallback
 
@@ -56,6 +58,8 @@ class Panel(HasInterfaceObject, BasePanel[Judge]):
     ) -> None:
         self._interface = PanelInterfaceClient(session_id=session_id)
         self._callbacks: dict[Stage, TaskCallback] = {}
+        self._pre_update_turns = TurnKeeper()
+        self._post_update_turns = TurnKeeper()
 
         if pre_callback is not None:
             self._callbacks[Stage.PRE] = pre_callback
@@ -75,6 +79,22 @@ class Panel(HasInterfaceObject, BasePanel[Judge]):
 
     async def reset_panel(self) -> None:
         await self.interface.panel_reset(debate_info=self.debate_info)
+        self._pre_update_turns = TurnKeeper()
+        self._post_update_turns = TurnKeeper()
+
+    async def update(self, *, speech: Speech) -> None:
+        async with self._pre_update_turns.turn(speech.index), TaskGroup() as tg:
+            for judge in self.judges:
+                tg.create_task(judge.pre_update(speech=speech))
+
+        try:
+            await self.interface.panel_update(speech=speech)
+
+            async with self._post_update_turns.turn(speech.index), TaskGroup() as tg:
+                for judge in self.judges:
+                    tg.create_task(judge.post_update(speech=speech))
+        finally:
+            await self._post_update_turns.advance(speech.index)
 
     async def pre_summarize(self, *, verdicts: Iterable[DimensionalVerdict]) -> None:
         await self.callback(
@@ -63,6 +63,9 @@ class PanelInterfaceClient(APIClient):
     async def panel_reset(self, *, debate_info: DebateInfo) -> None:
         await self.query(self._quote("/panel/reset"), debate_info, output_type=NoneType)
 
+    async def panel_update(self, *, speech: Speech) -> None:
+        await self.query(self._quote("/panel/update"), speech, output_type=NoneType)
+
     async def panel_summarize(self, *, verdicts: Iterable[DimensionalVerdict]) -> Verdict:
         result: Verdict | None = await self.query(
             self._quote("/panel/summarize"), list(verdicts), output_type=Verdict
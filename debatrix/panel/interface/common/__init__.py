@@ -1,6 +1,7 @@
-from .common import BiModeTaskGroup, StreamingCallback
+from .common import BiModeTaskGroup, StreamingCallback, TurnKeeper
 from .helper import Helper, InterfaceWithHelper
-from .memory import Memory, MemoryType
+from .index import EmbeddingDType, MemoryConfig, VectorIndexBackend
+from .memory import Memory, MemoryQuery, MemoryType
 from .parser import ParserConfig
 from .template import PromptTemplate, TemplateInfo
 from .verdict import VerdictExtractorConfig
@@ -10,10 +11,15 @@ __all__ = [
     "TemplateInfo",
     "ParserConfig",
     "VerdictExtractorConfig",
+    "VectorIndexBackend",
+    "EmbeddingDType",
+    "MemoryConfig",
     "MemoryType",
+    "MemoryQuery",
     "Memory",
     "BiModeTaskGroup",
     "StreamingCallback",
+    "TurnKeeper",
     "Helper",
     "InterfaceWithHelper",
 ]
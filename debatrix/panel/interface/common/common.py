@@ -1,5 +1,6 @@
-from asyncio import Lock, Task, TaskGroup
-from collections.abc import Callable, Coroutine
+from asyncio import Condition, Lock, Task, TaskGroup
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from typing import Any, TypeVar
 
 from ....common import ANone
@@ -24,3 +25,30 @@ class BiModeTaskGroup(TaskGroup):
                 return await coroutine
 
         return super().create_task(wrapped())
+
+
+class TurnKeeper:
+    def __init__(self, *, start: int = 1) -> None:
+        self._turn = start
+        self._condition = Condition()
+
+    def is_turn(self, index: int, /) -> bool:
+        return self._turn >= index
+
+    async def wait(self, index: int, /) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._turn >= index)
+
+    async def advance(self, index: int, /) -> None:
+        async with self._condition:
+            self._turn = max(self._turn, index + 1)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def turn(self, index: int, /) -> AsyncIterator[None]:
+        await self.wait(index)
+
+        try:
+            yield
+        finally:
+            await self.advance(index)
@@ -1,29 +1,44 @@
 from abc import ABC, abstractmethod
+from asyncio import Task
 from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import Logger, getLogger
 from typing import Any, Generic, Iterable, TypeVar
 
+from aiohttp import ClientError
+
 from ....api import ServerInfo
 from ....core.action import AllPanelActions
 from ....core.common import DebateInfo, DebaterName, DimensionInfo, DimensionName, Speech
-from ....model import ChatHistory, ChatMessage, ModelClient, ChatRole
+from ....model import ChatHistory, ChatMessage, ChatRole, ModelClient
 from ....util import sanitize
-from .common import StreamingCallback
-from .memory import Memory
+from .common import BiModeTaskGroup, StreamingCallback
+from .index import MemoryConfig
+from .memory import Memory, SpeechStore
 from .parser import JSONParser, ParserConfig
 from .template import MessageTemplate, PromptTemplate, TemplateInfo
 from .verdict import VerdictExtractor, VerdictExtractorConfig
 
 T = TypeVar("T", bound=str)
+BufferedCallback = tuple[ChatMessage | None, AllPanelActions, DimensionName]
 
 
 class Helper:
     def __init__(self, *, session_id: str, callback: StreamingCallback | None = None) -> None:
         self._callback_func = callback
+        self._logger: Logger = getLogger(__name__)
+        self._callback_buffer: ContextVar[list[BufferedCallback] | None] = ContextVar(
+            "callback_buffer", default=None
+        )
 
         self._model = ModelClient(session_id=session_id)
 
         self._parser = JSONParser()
         self._verdict_extractor = VerdictExtractor()
+        self._memory_config = MemoryConfig()
+        self._speech_store = SpeechStore(model=self._model, config=self._memory_config)
 
         self._dimensions: dict[DimensionName, DimensionInfo] = {}
         self._memories: dict[DimensionName, Memory] = {}
@@ -37,6 +52,10 @@ class Helper:
     def verdict_extractor_config(self) -> VerdictExtractorConfig:
         return self._verdict_extractor.config
 
+    @property
+    def memory_config(self) -> MemoryConfig:
+        return self._memory_config
+
     @property
     def dimensions(self) -> list[DimensionInfo]:
         return sorted(self._dimensions.values(), key=lambda x: (-x.weight, x.name))
@@ -53,6 +72,11 @@ class Helper:
     def verdict_extractor_config(self, config: VerdictExtractorConfig) -> None:
         self._verdict_extractor.config = config
 
+    @memory_config.setter
+    def memory_config(self, config: MemoryConfig) -> None:
+        self._memory_config = config
+        self._speech_store = SpeechStore(model=self._model, config=config)
+
     def set_model_server(self, *, server_info: ServerInfo) -> None:
         self._model.set_server_info(server_info)
 
@@ -65,11 +89,14 @@ class Helper:
         self, dimension_name: DimensionName, dimension: DimensionInfo, /
     ) -> None:
         self._dimensions[dimension_name] = dimension
-        self._memories[dimension_name] = Memory(model=self._model)
+        self._memories[dimension_name] = Memory(
+            model=self._model, config=self._memory_config, speech_store=self._speech_store
+        )
         self._sources[dimension_name] = defaultdict(list)
 
     async def set_debate_info(self, debate_info: DebateInfo, /) -> None:
         self._debate_info = debate_info
+        await self._speech_store.reset()
 
     def get_dimension_memory(self, dimension_name: DimensionName, /) -> Memory:
         return self._memories[dimension_name]
@@ -105,15 +132,27 @@ class Helper:
             cache.append(message)
             await self.callback(message, action=action, dimension_name=callback_dimension_name)
 
-        response: ChatMessage = await self._model.chat_predict(
-            messages=ChatHistory(root=tuple(cache))
-        )
+        messages: ChatHistory = ChatHistory(root=tuple(cache))
 
-        cache.append(response)
-        if allow_ai_callback or response.role != ChatRole.AI:
-            await self.callback(response, action=action, dimension_name=callback_dimension_name)
+        if not allow_ai_callback:
+            return (await self._model.chat_predict(messages=messages)).content
 
-        return response.content
+        chunks: list[str] = []
+
+        try:
+            async for delta in self._model.chat_stream(messages=messages):
+                chunks.append(delta.content)
+                await self.callback(delta, action=action, dimension_name=callback_dimension_name)
+        except (ClientError, RuntimeError, TimeoutError):
+            self._logger.warning(
+                "streamed chat failed, falling back to a direct prediction", exc_info=True
+            )
+
+            result: ChatMessage = await self._model.chat_predict(messages=messages)
+            await self.callback(result, action=action, dimension_name=callback_dimension_name)
+            return result.content
+
+        return "".join(chunks)
 
     async def get_speech_score(self, *, debater_name: DebaterName, judgment: str) -> int:
         return await self._verdict_extractor.get_speech_score(
@@ -132,6 +171,51 @@ class Helper:
             self.debate_info, judgment, model=self._model, parser=self._parser
         )
 
+    async def get_verdict(
+        self, *, judgment: str, concurrent: bool
+    ) -> tuple[list[tuple[int, str]], DebaterName]:
+        debater_names: list[DebaterName] = [
+            debater_info.name for debater_info in self.debate_info.all_debaters_info
+        ]
+
+        results: dict[DebaterName, tuple[int, str]] = {}
+        winner: DebaterName | None = None
+
+        if self._verdict_extractor.config.fused_extraction:
+            try:
+                results, winner = await self._verdict_extractor.get_debater_scores_and_winner(
+                    self.debate_info, judgment, model=self._model, parser=self._parser
+                )
+            except (RuntimeError, ValueError):
+                self._logger.warning(
+                    "fused verdict extraction failed, extracting per debater instead", exc_info=True
+                )
+
+        async with BiModeTaskGroup(concurrent=concurrent) as tg:
+            debater_tasks: dict[DebaterName, Task[tuple[int, str]]] = {
+                debater_name: tg.create_task(
+                    self.get_debater_score_and_judgment(
+                        debater_name=debater_name, judgment=judgment
+                    )
+                )
+                for debater_name in debater_names
+                if debater_name not in results
+            }
+
+            winner_task: Task[DebaterName] | None = (
+                tg.create_task(self.get_winner(judgment=judgment)) if winner is None else None
+            )
+
+        results.update(
+            {debater_name: task.result() for debater_name, task in debater_tasks.items()}
+        )
+
+        if winner_task is not None:
+            winner = winner_task.result()
+
+        assert winner is not None
+        return [results[debater_name] for debater_name in debater_names], winner
+
     async def callback(
         self,
         message: ChatMessage | None,
@@ -140,13 +224,31 @@ class Helper:
         action: AllPanelActions,
         dimension_name: DimensionName,
     ) -> None:
-        if self._callback_func is not None:
+        buffer: list[BufferedCallback] | None = self._callback_buffer.get()
+
+        if buffer is not None:
+            buffer.append((message, action, dimension_name))
+        elif self._callback_func is not None:
             await self._callback_func(
                 action,
                 dimension_name,
                 None if message is None else (message.role.value, message.content),
             )
 
+    @contextmanager
+    def buffer_callbacks(self) -> Iterator[list[BufferedCallback]]:
+        buffer: list[BufferedCallback] = []
+        token = self._callback_buffer.set(buffer)
+
+        try:
+            yield buffer
+        finally:
+            self._callback_buffer.reset(token)
+
+    async def flush_callbacks(self, buffer: list[BufferedCallback], /) -> None:
+        for message, action, dimension_name in buffer:
+            await self.callback(message, action=action, dimension_name=dimension_name)
+
     async def close(self) -> None:
         await self._model.close()
 
@@ -172,22 +274,40 @@ class InterfaceWithHelper(ABC, Generic[T]):
         raise NotImplementedError()
 
     def set_templates(
-        self, templates: Iterable[TemplateInfo[T]], /, *, common_system_prompt: str | None = None
+        self,
+        templates: Iterable[TemplateInfo[T]],
+        /,
+        *,
+        common_system_prompt: str | None = None,
+        separate_common_system_prompt: bool = False,
     ) -> None:
         self._templates = {
             template.name: self._add_common_system_prompt(
-                template.messages, common_system_prompt=common_system_prompt
+                template.messages,
+                common_system_prompt=common_system_prompt,
+                separate=separate_common_system_prompt,
             )
             for template in templates
         }
 
+        for prompt_template in self._templates.values():
+            for message_template in prompt_template:
+                message_template.compile()
+
     @staticmethod
     def _add_common_system_prompt(
-        template: PromptTemplate, /, *, common_system_prompt: str | None = None
+        template: PromptTemplate,
+        /,
+        *,
+        common_system_prompt: str | None = None,
+        separate: bool = False,
     ) -> PromptTemplate:
         if common_system_prompt is None:
             return template
 
+        if separate:
+            return (MessageTemplate(role=ChatRole.SYSTEM, content=common_system_prompt), *template)
+
         return (
             MessageTemplate(
                 role=template[0].role,
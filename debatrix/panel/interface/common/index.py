@@ -0,0 +1,290 @@
+import enum
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+from pydantic.dataclasses import dataclass
+
+
+@enum.unique
+class VectorIndexBackend(enum.StrEnum):
+    EXACT = enum.auto()
+    IVF = enum.auto()
+
+
+@enum.unique
+class EmbeddingDType(enum.StrEnum):
+    FLOAT32 = enum.auto()
+    FLOAT16 = enum.auto()
+    INT8 = enum.auto()
+
+
+@dataclass(frozen=True, kw_only=True)
+class MemoryConfig:
+    index_backend: VectorIndexBackend = VectorIndexBackend.EXACT
+    storage_dtype: EmbeddingDType = EmbeddingDType.FLOAT32
+    ivf_lists: int = 64
+    ivf_probes: int = 8
+    ivf_min_train_size: int = 1024
+    ivf_iterations: int = 10
+
+
+class VectorIndex(ABC):
+    INITIAL_CAPACITY: int = 64
+    SCORE_BLOCK_SIZE: int = 4096
+
+    def __init__(self, *, config: MemoryConfig) -> None:
+        self._config = config
+
+        self._buffer: np.ndarray | None = None
+        self._scale_buffer: np.ndarray | None = None
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.vectors(slice(0, self._size))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            0 if buffer is None else buffer[: self._size].nbytes
+            for buffer in (self._buffer, self._scale_buffer)
+        )
+
+    def vectors(self, rows: slice | np.ndarray, /) -> np.ndarray:
+        if self._buffer is None:
+            return np.empty((0, 0), dtype=np.float32)
+
+        vectors: np.ndarray = self._buffer[: self._size][rows].astype(np.float32)
+
+        if self._scale_buffer is not None:
+            vectors *= self._scale_buffer[: self._size][rows, None]
+
+        return vectors
+
+    def add(self, vectors: np.ndarray, /) -> None:
+        start: int = self._size
+        self._extend(vectors)
+        self._on_add(start)
+
+    def search(self, queries: np.ndarray, candidates: list[int], /, *, k: int | None) -> list[int]:
+        if k is not None and k <= 0:
+            return []
+
+        if k is None or k >= len(candidates):
+            return sorted(candidates)
+
+        return self._search(queries, np.asarray(candidates, dtype=np.int64), k=k)
+
+    def save(self, path: str | Path, /) -> None:
+        np.savez(path, matrix=self.matrix, **self._state())
+
+    def load(self, path: str | Path, /) -> None:
+        with np.load(path) as data:
+            self._buffer = None
+            self._scale_buffer = None
+            self._size = 0
+            self._extend(data["matrix"])
+            self._load_state(dict(data))
+
+    @abstractmethod
+    def _search(self, queries: np.ndarray, candidates: np.ndarray, /, *, k: int) -> list[int]:
+        raise NotImplementedError()
+
+    def _on_add(self, start: int, /) -> None:
+        pass
+
+    def _state(self) -> dict[str, np.ndarray]:
+        return {}
+
+    def _load_state(self, data: dict[str, np.ndarray], /) -> None:
+        pass
+
+    def _exact_top_k(self, queries: np.ndarray, candidates: np.ndarray, /, *, k: int) -> list[int]:
+        if k >= len(candidates):
+            return sorted(candidates.tolist())
+
+        sim: np.ndarray = np.max(self._similarity(candidates, queries), axis=1)
+        return sorted(candidates[np.argpartition(-sim, k - 1)[:k]].tolist())
+
+    def _similarity(self, rows: np.ndarray, queries: np.ndarray, /) -> np.ndarray:
+        assert self._buffer is not None
+        vectors: np.ndarray = self._buffer[: self._size][rows]
+
+        if vectors.dtype == np.int8:
+            assert self._scale_buffer is not None
+            query_scales: np.ndarray = np.maximum(np.max(np.abs(queries), axis=1), 1e-8) / 127
+
+            sim: np.ndarray = np.einsum(
+                "nd,qd->nq",
+                vectors,
+                np.round(queries / query_scales[:, None]).astype(np.int8),
+                dtype=np.int32,
+            ).astype(np.float32)
+
+            sim *= self._scale_buffer[: self._size][rows, None]
+            sim *= query_scales[None, :]
+            return sim
+
+        if vectors.dtype == np.float16:
+            return np.concatenate(
+                [
+                    vectors[start : start + self.SCORE_BLOCK_SIZE].astype(np.float32) @ queries.T
+                    for start in range(0, vectors.shape[0], self.SCORE_BLOCK_SIZE)
+                ]
+            )
+
+        return vectors @ queries.T
+
+    def _extend(self, vectors: np.ndarray, /) -> None:
+        size: int = self._size + vectors.shape[0]
+        dtype: EmbeddingDType = self._config.storage_dtype
+
+        if dtype == EmbeddingDType.FLOAT32:
+            self._buffer = self._reserve(self._buffer, self._size, size, vectors.shape[1:])
+            self._buffer[self._size : size] = vectors
+        elif dtype == EmbeddingDType.FLOAT16:
+            self._buffer = self._reserve(
+                self._buffer, self._size, size, vectors.shape[1:], dtype=np.float16
+            )
+
+            self._buffer[self._size : size] = vectors
+        elif dtype == EmbeddingDType.INT8:
+            scales: np.ndarray = np.maximum(np.max(np.abs(vectors), axis=1), 1e-8) / 127
+
+            self._buffer = self._reserve(
+                self._buffer, self._size, size, vectors.shape[1:], dtype=np.int8
+            )
+
+            self._scale_buffer = self._reserve(self._scale_buffer, self._size, size, ())
+            self._buffer[self._size : size] = np.round(vectors / scales[:, None])
+            self._scale_buffer[self._size : size] = scales
+        else:
+            raise ValueError(dtype)
+
+        self._size = size
+
+    def _reserve(
+        self,
+        buffer: np.ndarray | None,
+        size: int,
+        needed: int,
+        shape: tuple[int, ...],
+        /,
+        *,
+        dtype: type[np.generic] = np.float32,
+    ) -> np.ndarray:
+        if buffer is None:
+            return np.empty((max(needed, self.INITIAL_CAPACITY), *shape), dtype=dtype)
+
+        if needed <= buffer.shape[0]:
+            return buffer
+
+        new_buffer: np.ndarray = np.empty(
+            (max(needed, buffer.shape[0] * 2), *buffer.shape[1:]), dtype=buffer.dtype
+        )
+
+        new_buffer[:size] = buffer[:size]
+        return new_buffer
+
+
+class ExactVectorIndex(VectorIndex):
+    def _search(self, queries: np.ndarray, candidates: np.ndarray, /, *, k: int) -> list[int]:
+        return self._exact_top_k(queries, candidates, k=k)
+
+
+class IVFVectorIndex(VectorIndex):
+    def __init__(self, *, config: MemoryConfig) -> None:
+        super().__init__(config=config)
+
+        self._centroids: np.ndarray | None = None
+        self._assignment_buffer: np.ndarray | None = None
+        self._trained_size: int = 0
+
+    @property
+    def _assignments(self) -> np.ndarray:
+        assert self._assignment_buffer is not None
+        return self._assignment_buffer[: self._size]
+
+    def _search(self, queries: np.ndarray, candidates: np.ndarray, /, *, k: int) -> list[int]:
+        if self._centroids is None:
+            return self._exact_top_k(queries, candidates, k=k)
+
+        probes: int = min(self._config.ivf_probes, self._centroids.shape[0])
+        centroid_sim: np.ndarray = queries @ self._centroids.T
+
+        probed: np.ndarray = np.unique(
+            np.argpartition(-centroid_sim, probes - 1, axis=1)[:, :probes]
+        )
+
+        shortlist: np.ndarray = candidates[np.isin(self._assignments[candidates], probed)]
+
+        if len(shortlist) < k:
+            return self._exact_top_k(queries, candidates, k=k)
+
+        return self._exact_top_k(queries, shortlist, k=k)
+
+    def _on_add(self, start: int, /) -> None:
+        if self._size >= max(self._config.ivf_min_train_size, 2 * self._trained_size):
+            self._train()
+        elif self._centroids is not None:
+            self._assignment_buffer = self._reserve(
+                self._assignment_buffer, start, self._size, (), dtype=np.int32
+            )
+
+            self._assignment_buffer[start : self._size] = self._assign(
+                self.vectors(slice(start, self._size))
+            )
+
+    def _train(self) -> None:
+        matrix: np.ndarray = self.matrix
+        n_lists: int = min(self._config.ivf_lists, self._size)
+        gen: np.random.Generator = np.random.default_rng(self._size)
+
+        centroids: np.ndarray = matrix[gen.choice(self._size, size=n_lists, replace=False)].copy()
+
+        for _ in range(self._config.ivf_iterations):
+            assignments: np.ndarray = np.argmax(matrix @ centroids.T, axis=1)
+
+            for i in range(n_lists):
+                members: np.ndarray = matrix[assignments == i]
+
+                if len(members) > 0:
+                    centroid: np.ndarray = members.sum(axis=0)
+                    centroids[i] = centroid / max(float(np.linalg.norm(centroid)), 1e-8)
+
+        self._centroids = centroids
+        self._assignment_buffer = self._assign(matrix)
+        self._trained_size = self._size
+
+    def _assign(self, vectors: np.ndarray, /) -> np.ndarray:
+        assert self._centroids is not None
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _state(self) -> dict[str, np.ndarray]:
+        if self._centroids is None:
+            return {}
+
+        return {
+            "centroids": self._centroids,
+            "assignments": self._assignments,
+            "trained_size": np.asarray(self._trained_size),
+        }
+
+    def _load_state(self, data: dict[str, np.ndarray], /) -> None:
+        if "centroids" in data:
+            self._centroids = data["centroids"]
+            self._assignment_buffer = data["assignments"].astype(np.int32)
+            self._trained_size = int(data["trained_size"])
+
+
+def create_vector_index(config: MemoryConfig, /) -> VectorIndex:
+    if config.index_backend == VectorIndexBackend.EXACT:
+        return ExactVectorIndex(config=config)
+    elif config.index_backend == VectorIndexBackend.IVF:
+        return IVFVectorIndex(config=config)
+    else:
+        raise ValueError(config.index_backend)
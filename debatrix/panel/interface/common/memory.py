@@ -1,13 +1,21 @@
 import enum
 from asyncio import Lock
-from collections.abc import Iterable
-from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from json import dumps, loads
+from pathlib import Path
+from typing import TypeVar, overload
 
 import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from ....core.common import Speech
 from ....model import ModelClient
+from ....util import sanitize
+from .index import MemoryConfig, VectorIndex, create_vector_index
+
+T = TypeVar("T")
 
 
 @enum.unique
@@ -32,71 +40,185 @@ class MemoryChunk:
         return source, self.content
 
 
-class Memory:
-    def __init__(self, *, model: ModelClient) -> None:
+@dataclass(kw_only=True)
+class MemoryQuery:
+    query: str | list[str]
+    k: int | None = None
+    include_types: MemoryType | Iterable[MemoryType] | None = None
+    include_sources: str | Iterable[str] | None = None
+    exclude_sources: str | Iterable[str] | None = None
+    format_source: bool = False
+
+
+class MemoryView(Sequence[tuple[str, str]]):
+    def __init__(self, pairs: list[tuple[str, str]], /) -> None:
+        self._pairs = pairs
+        self._length: int = len(pairs)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[str, str]:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[str, str]]:
+        pass
+
+    def __getitem__(self, index: int | slice) -> tuple[str, str] | list[tuple[str, str]]:
+        if isinstance(index, slice):
+            return [self._pairs[i] for i in range(self._length)[index]]
+        else:
+            return self._pairs[range(self._length)[index]]
+
+
+class SpeechStore:
+    def __init__(self, *, model: ModelClient, config: MemoryConfig | None = None) -> None:
         self._splitter = RecursiveCharacterTextSplitter(chunk_size=512, chunk_overlap=128)
         self._model = model
+        self._config: MemoryConfig = sanitize(config, MemoryConfig())
+        self._clear()
+
+    @property
+    def index(self) -> VectorIndex:
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._chunks)
 
     async def reset(self) -> None:
-        self._memory: list[MemoryChunk] = []
-        self._embedding_matrix: np.ndarray | None = None
+        self._clear()
 
-        self._buffer: list[MemoryChunk] = []
-        self._buffer_lock = Lock()
+    def add_speech(self, speech: Speech, /, *, source: str, cut: bool = True) -> list[int]:
+        key: tuple[str, str, bool] = (source, speech.content, cut)
 
-    async def add_speech(self, speech: Speech, /, *, source: str, cut: bool = True) -> None:
-        if cut:
-            self._buffer.extend(
-                [
-                    MemoryChunk(type=MemoryType.SPEECH, source=source, content=doc.page_content)
-                    for doc in self._splitter.create_documents([speech.content])
-                ]
-            )
-        else:
-            self._buffer.append(
-                MemoryChunk(type=MemoryType.SPEECH, source=source, content=speech.content)
+        if key not in self._speeches:
+            contents: list[str] = (
+                [doc.page_content for doc in self._splitter.create_documents([speech.content])]
+                if cut
+                else [speech.content]
             )
 
-    async def add_analyses(self, analyses: list[str], /, *, source: str) -> None:
-        self._buffer.extend(
-            [
-                MemoryChunk(type=MemoryType.ANALYSIS, source=source, content=reflection)
-                for reflection in analyses
+            self._speeches[key] = [
+                self._add_chunk(MemoryChunk(type=MemoryType.SPEECH, source=source, content=content))
+                for content in contents
             ]
-        )
 
-    def fetch(
+        return self._speeches[key]
+
+    async def restore(self, chunks: list[MemoryChunk], vectors: np.ndarray, /) -> list[int]:
+        await self.flush()
+        rows: list[int] = []
+
+        async with self._flush_lock:
+            for i, chunk in enumerate(chunks):
+                row: int | None = self._rows.get((chunk.source, chunk.content))
+
+                if row is None:
+                    row = self._add_chunk(chunk)
+
+                    if i < len(vectors) and row == len(self._index):
+                        self._index.add(vectors[i : i + 1])
+
+                rows.append(row)
+
+        return rows
+
+    def chunk(self, row: int, /) -> MemoryChunk:
+        return self._chunks[row]
+
+    async def flush(self) -> None:
+        if len(self._chunks) > len(self._index):
+            async with self._flush_lock:
+                pending: list[MemoryChunk] = self._chunks[len(self._index) :]
+
+                if len(pending) > 0:
+                    self._index.add(
+                        await self.embed_many(
+                            ["\n\n".join(chunk.as_pair(format_source=True)) for chunk in pending]
+                        )
+                    )
+
+    async def embed_many(self, texts: Iterable[str], /) -> np.ndarray:
+        embeddings: np.ndarray = await self._model.embed_many_array(batch=texts)
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def _add_chunk(self, chunk: MemoryChunk, /) -> int:
+        row: int = self._rows.setdefault((chunk.source, chunk.content), len(self._chunks))
+
+        if row == len(self._chunks):
+            self._chunks.append(chunk)
+
+        return row
+
+    def _clear(self) -> None:
+        self._chunks: list[MemoryChunk] = []
+        self._rows: dict[tuple[str, str], int] = {}
+        self._speeches: dict[tuple[str, str, bool], list[int]] = {}
+        self._index: VectorIndex = create_vector_index(self._config)
+        self._flush_lock = Lock()
+
+
+class Memory:
+    def __init__(
         self,
         *,
-        include_types: MemoryType | Iterable[MemoryType] | None = None,
-        include_sources: str | Iterable[str] | None = None,
-        exclude_sources: str | Iterable[str] | None = None,
-        format_source: bool = False,
-    ) -> list[tuple[str, str]]:
-        result: list[MemoryChunk] = self._memory + self._buffer
+        model: ModelClient,
+        config: MemoryConfig | None = None,
+        speech_store: SpeechStore | None = None,
+    ) -> None:
+        self._model = model
+        self._config: MemoryConfig = sanitize(config, MemoryConfig())
 
-        if include_types is not None:
-            type_set: set[MemoryType] = (
-                {include_types} if isinstance(include_types, MemoryType) else set(include_types)
-            )
+        self._store: SpeechStore = (
+            SpeechStore(model=model, config=self._config) if speech_store is None else speech_store
+        )
 
-            result = [chunk for chunk in result if chunk.type in type_set]
+    async def reset(self) -> None:
+        self._chunks: list[MemoryChunk] = []
+        self._rows: list[int] = []
+        self._analyses: list[MemoryChunk] = []
+        self._analysis_positions: list[int] = []
+        self._type_index: defaultdict[MemoryType, list[int]] = defaultdict(list)
+        self._source_index: defaultdict[str, list[int]] = defaultdict(list)
 
-        if include_sources is not None:
-            source_set: set[str] = (
-                {include_sources} if isinstance(include_sources, str) else set(include_sources)
-            )
+        self._views: dict[tuple[frozenset[MemoryType] | None, bool], list[tuple[str, str]]] = {}
+        self._view_cursors: dict[tuple[frozenset[MemoryType] | None, bool], int] = {}
 
-            result = [chunk for chunk in result if chunk.source in source_set]
+        self._index: VectorIndex = create_vector_index(self._config)
+        self._flush_lock = Lock()
 
-        if exclude_sources is not None:
-            source_set: set[str] = (
-                {exclude_sources} if isinstance(exclude_sources, str) else set(exclude_sources)
-            )
+    async def add_speech(self, speech: Speech, /, *, source: str, cut: bool = True) -> None:
+        for row in self._store.add_speech(speech, source=source, cut=cut):
+            self._add_chunk(self._store.chunk(row), row=row)
 
-            result = [chunk for chunk in result if chunk.source not in source_set]
+    async def add_analyses(self, analyses: list[str], /, *, source: str) -> None:
+        for reflection in analyses:
+            self._add_chunk(
+                MemoryChunk(type=MemoryType.ANALYSIS, source=source, content=reflection)
+            )
 
-        return [chunk.as_pair(format_source=format_source) for chunk in result]
+    def fetch(
+        self,
+        *,
+        include_types: MemoryType | Iterable[MemoryType] | None = None,
+        include_sources: str | Iterable[str] | None = None,
+        exclude_sources: str | Iterable[str] | None = None,
+        format_source: bool = False,
+    ) -> Sequence[tuple[str, str]]:
+        if include_sources is None and exclude_sources is None:
+            return self._get_view(include_types, format_source=format_source)
+
+        return [
+            self._chunks[index].as_pair(format_source=format_source)
+            for index in self._select(
+                len(self._chunks),
+                include_types=include_types,
+                include_sources=include_sources,
+                exclude_sources=exclude_sources,
+            )
+        ]
 
     async def query(
         self,
@@ -109,77 +231,256 @@ class Memory:
         exclude_sources: str | Iterable[str] | None = None,
         format_source: bool = False,
     ) -> list[tuple[str, str]]:
-        if isinstance(query, str):
-            query = [query]
+        return (
+            await self.query_many(
+                [
+                    MemoryQuery(
+                        query=query,
+                        k=k,
+                        include_types=include_types,
+                        include_sources=include_sources,
+                        exclude_sources=exclude_sources,
+                        format_source=format_source,
+                    )
+                ]
+            )
+        )[0]
+
+    async def query_many(self, queries: Sequence[MemoryQuery], /) -> list[list[tuple[str, str]]]:
+        await self._flush()
+
+        candidates: list[list[int]] = []
+        texts: list[str] = []
+        offsets: list[int] = []
+
+        for query in queries:
+            query_texts: list[str] = [query.query] if isinstance(query.query, str) else query.query
+            assert len(query_texts) > 0
+
+            candidates.append(
+                self._select(
+                    len(self._chunks),
+                    include_types=query.include_types,
+                    include_sources=query.include_sources,
+                    exclude_sources=query.exclude_sources,
+                )
+            )
 
-        assert len(query) > 0
+            offsets.append(len(texts))
+            if query.k is not None and 0 < query.k < len(candidates[-1]):
+                texts.extend(query_texts)
 
-        if len(self._buffer) > 0:
-            async with self._buffer_lock:
-                if len(self._buffer) > 0:
-                    self._memory.extend(self._buffer)
+        qe: np.ndarray = await self._embed_many(texts) if len(texts) > 0 else np.empty((0, 0))
+        offsets.append(len(texts))
+        results: list[list[tuple[str, str]]] = []
 
-                    embeddings: np.ndarray = await self._embed_many(
-                        ["\n\n".join(chunk.as_pair(format_source=True)) for chunk in self._buffer]
-                    )
+        for i, (query, candidate) in enumerate(zip(queries, candidates)):
+            selected: list[int] = self._search(
+                qe[offsets[i] : offsets[i + 1]], candidate, k=query.k
+            )
+
+            results.append(
+                [
+                    self._chunks[index].as_pair(format_source=query.format_source)
+                    for index in selected
+                ]
+            )
+
+        return results
+
+    def save(self, path: str | Path, /) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        (path / "chunks.json").write_text(
+            dumps([asdict(chunk) for chunk in self._chunks], ensure_ascii=False), encoding="utf8"
+        )
+
+        speech_rows: list[int] = []
 
-                    if self._embedding_matrix is None:
-                        self._embedding_matrix = embeddings
-                    else:
-                        self._embedding_matrix = np.concatenate(
-                            [self._embedding_matrix, embeddings], axis=0
+        for chunk, row in zip(self._chunks, self._rows):
+            if chunk.type == MemoryType.SPEECH:
+                if row >= len(self._store.index):
+                    break
+
+                speech_rows.append(row)
+
+        np.save(
+            path / "speeches.npy",
+            self._store.index.vectors(np.asarray(speech_rows, dtype=np.int64)),
+        )
+        self._index.save(path / "index.npz")
+
+    async def load(self, path: str | Path, /) -> None:
+        path = Path(path)
+        await self.reset()
+
+        chunks: list[MemoryChunk] = [
+            MemoryChunk(
+                type=MemoryType(item["type"]), source=item["source"], content=item["content"]
+            )
+            for item in loads((path / "chunks.json").read_text(encoding="utf8"))
+        ]
+
+        speech_rows: Iterator[int] = iter(
+            await self._store.restore(
+                [chunk for chunk in chunks if chunk.type == MemoryType.SPEECH],
+                np.load(path / "speeches.npy"),
+            )
+        )
+
+        for chunk in chunks:
+            if chunk.type == MemoryType.SPEECH:
+                row: int = next(speech_rows)
+                self._add_chunk(self._store.chunk(row), row=row)
+            else:
+                self._add_chunk(chunk)
+
+        self._index.load(path / "index.npz")
+
+    async def _flush(self) -> None:
+        await self._store.flush()
+
+        if len(self._analyses) > len(self._index):
+            async with self._flush_lock:
+                pending: list[MemoryChunk] = self._analyses[len(self._index) :]
+
+                if len(pending) > 0:
+                    self._index.add(
+                        await self._embed_many(
+                            ["\n\n".join(chunk.as_pair(format_source=True)) for chunk in pending]
                         )
+                    )
 
-                    self._buffer.clear()
+    def _add_chunk(self, chunk: MemoryChunk, /, *, row: int | None = None) -> None:
+        index: int = len(self._chunks)
+        self._chunks.append(chunk)
+        self._type_index[chunk.type].append(index)
+        self._source_index[chunk.source].append(index)
 
-        result_index: list[int] = list(range(len(self._memory)))
+        if row is None:
+            self._rows.append(len(self._analyses))
+            self._analyses.append(chunk)
+            self._analysis_positions.append(index)
+        else:
+            self._rows.append(row)
+
+    def _search(self, queries: np.ndarray, candidates: list[int], /, *, k: int | None) -> list[int]:
+        if k is not None and k <= 0:
+            return []
+
+        speech_positions: defaultdict[int, list[int]] = defaultdict(list)
+        analysis_rows: list[int] = []
+
+        for index in candidates:
+            row: int = self._rows[index]
+
+            if self._chunks[index].type == MemoryType.SPEECH:
+                if row < len(self._store.index):
+                    speech_positions[row].append(index)
+            elif row < len(self._index):
+                analysis_rows.append(row)
+
+        speech_rows: list[int] = list(speech_positions)
+
+        if k is not None and k < len(speech_rows) + len(analysis_rows):
+            speech_rows = self._store.index.search(queries, speech_rows, k=k)
+            analysis_rows = self._index.search(queries, analysis_rows, k=k)
+
+        selected: list[int] = [
+            position for row in speech_rows for position in speech_positions[row]
+        ] + [self._analysis_positions[row] for row in analysis_rows]
+
+        if k is None or k >= len(selected):
+            return sorted(selected)
+
+        vectors: np.ndarray = np.concatenate(
+            [
+                index.vectors(np.asarray(rows, dtype=np.int64))
+                for index, rows in (
+                    (
+                        self._store.index,
+                        [row for row in speech_rows for _ in speech_positions[row]],
+                    ),
+                    (self._index, analysis_rows),
+                )
+                if len(rows) > 0
+            ]
+        )
+
+        sim: np.ndarray = np.max(vectors @ queries.T, axis=1)
+        return sorted(selected[i] for i in np.argpartition(-sim, k - 1)[:k].tolist())
+
+    def _get_view(
+        self, include_types: MemoryType | Iterable[MemoryType] | None, /, *, format_source: bool
+    ) -> MemoryView:
+        type_set: frozenset[MemoryType] | None = None
 
         if include_types is not None:
-            type_set: set[MemoryType] = (
-                {include_types} if isinstance(include_types, MemoryType) else set(include_types)
+            type_set = frozenset(
+                [include_types] if isinstance(include_types, MemoryType) else include_types
             )
 
-            result_index = [index for index in result_index if self._memory[index].type in type_set]
+        key: tuple[frozenset[MemoryType] | None, bool] = (type_set, format_source)
+        pairs: list[tuple[str, str]] = self._views.setdefault(key, [])
+
+        for chunk in self._chunks[self._view_cursors.get(key, 0) :]:
+            if type_set is None or chunk.type in type_set:
+                pairs.append(chunk.as_pair(format_source=format_source))
+
+        self._view_cursors[key] = len(self._chunks)
+        return MemoryView(pairs)
+
+    def _select(
+        self,
+        limit: int,
+        /,
+        *,
+        include_types: MemoryType | Iterable[MemoryType] | None = None,
+        include_sources: str | Iterable[str] | None = None,
+        exclude_sources: str | Iterable[str] | None = None,
+    ) -> list[int]:
+        selected: set[int] | None = None
+
+        if include_types is not None:
+            selected = self._lookup(
+                self._type_index,
+                [include_types] if isinstance(include_types, MemoryType) else include_types,
+            )
 
         if include_sources is not None:
-            source_set: set[str] = (
-                {include_sources} if isinstance(include_sources, str) else set(include_sources)
+            source_selected: set[int] = self._lookup(
+                self._source_index,
+                [include_sources] if isinstance(include_sources, str) else include_sources,
             )
 
-            result_index = [
-                index for index in result_index if self._memory[index].source in source_set
-            ]
+            selected = source_selected if selected is None else selected & source_selected
 
         if exclude_sources is not None:
-            source_set: set[str] = (
-                {exclude_sources} if isinstance(exclude_sources, str) else set(exclude_sources)
+            excluded: set[int] = self._lookup(
+                self._source_index,
+                [exclude_sources] if isinstance(exclude_sources, str) else exclude_sources,
             )
 
-            result_index = [
-                index for index in result_index if self._memory[index].source not in source_set
-            ]
+            if selected is None:
+                selected = set(range(limit))
 
-        if len(result_index) == 0 or self._embedding_matrix is None:
-            return []
+            selected -= excluded
 
-        qe: np.ndarray = await self._embed_many(query)
-        ve: np.ndarray = self._embedding_matrix[result_index, :]
-        sim: np.ndarray = np.max(ve @ qe.T, axis=1)
-        result_index = [result_index[i] for i in np.argsort(-sim)]
+        if selected is None:
+            return list(range(limit))
 
-        if k is not None:
-            result_index = result_index[:k]
+        return sorted(index for index in selected if index < limit)
 
-        result_index.sort()
-        return [self._memory[index].as_pair(format_source=format_source) for index in result_index]
+    @staticmethod
+    def _lookup(index: dict[T, list[int]], keys: Iterable[T], /) -> set[int]:
+        return {position for key in set(keys) for position in index.get(key, ())}
 
     async def _embed_one(self, text: str) -> np.ndarray:
-        return self._normalize(np.array(await self._model.embed_one(text)))
+        return self._normalize(await self._model.embed_one_array(text=text))
 
     async def _embed_many(self, texts: Iterable[str]) -> np.ndarray:
-        embeddings: np.ndarray = np.array(await self._model.embed_many(texts))
-        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
-        return embeddings
+        return await self._store.embed_many(texts)
 
     @staticmethod
     def _normalize(x: np.ndarray) -> np.ndarray:
@@ -1,12 +1,12 @@
 import re
 from json import JSONDecodeError, dumps, loads
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, ValidationError
 from pydantic.dataclasses import dataclass
 
 from ....model import ModelClient
-from .util import format_jinja2, make_single_chat
+from .util import compile_jinja2, format_jinja2, make_single_chat
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -18,6 +18,10 @@ class ParserConfig:
 
 
 class JSONParser:
+    def __init__(self) -> None:
+        self._schemas: dict[type[BaseModel], dict[str, Any]] = {}
+        self._schema_prompts: dict[type[BaseModel], str] = {}
+
     @property
     def config(self) -> ParserConfig:
         return self._config
@@ -25,11 +29,23 @@ class JSONParser:
     @config.setter
     def config(self, config: ParserConfig) -> None:
         self._config = config
+        self._schema_prompts.clear()
+        compile_jinja2(config.schema_prompt_template)
+        compile_jinja2(config.fix_prompt_template)
+
+    def get_schema(self, output_type: type[T], /) -> dict[str, Any]:
+        if output_type not in self._schemas:
+            self._schemas[output_type] = output_type.model_json_schema()
+
+        return self._schemas[output_type]
 
     def make_schema_prompt(self, output_type: type[T], /) -> str:
-        return format_jinja2(
-            self.config.schema_prompt_template, schema=dumps(output_type.model_json_schema())
-        )
+        if output_type not in self._schema_prompts:
+            self._schema_prompts[output_type] = format_jinja2(
+                self.config.schema_prompt_template, schema=dumps(self.get_schema(output_type))
+            )
+
+        return self._schema_prompts[output_type]
 
     async def parse(
         self,
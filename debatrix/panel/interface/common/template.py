@@ -4,7 +4,7 @@ from pydantic import field_validator
 from pydantic.dataclasses import dataclass
 
 from ....model import ChatMessage, ChatRole
-from .util import format_jinja2
+from .util import compile_jinja2, format_jinja2
 
 T = TypeVar("T", bound=str)
 
@@ -20,6 +20,9 @@ class MessageTemplate:
         assert v != ChatRole.EXTRA
         return v
 
+    def compile(self) -> None:
+        compile_jinja2(self.content)
+
     def format(self, **kwargs: Any) -> ChatMessage:
         return ChatMessage(role=self.role, content=format_jinja2(self.content, **kwargs))
 
@@ -1,11 +1,20 @@
-from jinja2 import StrictUndefined
+from functools import lru_cache
+
+from jinja2 import StrictUndefined, Template
 from jinja2.sandbox import SandboxedEnvironment
 
 from ....model import ChatHistory, ChatMessage, ChatRole
 
+JINJA2_ENV = SandboxedEnvironment(undefined=StrictUndefined)
+
+
+@lru_cache(maxsize=256)
+def compile_jinja2(template: str, /) -> Template:
+    return JINJA2_ENV.from_string(template)
+
 
 def format_jinja2(template: str, /, **kwargs) -> str:
-    return SandboxedEnvironment(undefined=StrictUndefined).from_string(template).render(**kwargs)
+    return compile_jinja2(template).render(**kwargs)
 
 
 def make_single_chat(template: str, /, **kwargs) -> ChatHistory:
@@ -6,7 +6,7 @@ from pydantic.dataclasses import dataclass
 from ....core.common import DebateInfo, DebaterName
 from ....model import ModelClient
 from .parser import JSONParser
-from .util import make_single_chat
+from .util import compile_jinja2, make_single_chat
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -24,11 +24,28 @@ class Winner(BaseModel, title="Winner of Debate", frozen=True):
     winner: DebaterName = Field(..., description="the final winner of the debate")
 
 
+class DebaterJudgmentAndScore(BaseModel, title="Judgment and Score of a Debater", frozen=True):
+    debater_name: DebaterName = Field(..., description="name of the debater")
+    judgment: str = Field(..., description="judgment for the debater")
+    score: int = Field(..., description="a score for the debater")
+
+
+class FullVerdict(BaseModel, title="Full Verdict of Debate", frozen=True):
+    debaters: list[DebaterJudgmentAndScore] = Field(
+        ..., description="judgment and score for each debater"
+    )
+
+    winner: DebaterName = Field(..., description="the final winner of the debate")
+
+
 @dataclass
 class VerdictExtractorConfig:
     speech_prompt_template: str
     debater_prompt_template: str
     winner_prompt_template: str
+    verdict_prompt_template: str = ""
+    structured_output: bool = False
+    fused_extraction: bool = False
 
 
 class VerdictExtractor:
@@ -39,6 +56,10 @@ class VerdictExtractor:
     @config.setter
     def config(self, config: VerdictExtractorConfig) -> None:
         self._config = config
+        compile_jinja2(config.speech_prompt_template)
+        compile_jinja2(config.debater_prompt_template)
+        compile_jinja2(config.winner_prompt_template)
+        compile_jinja2(config.verdict_prompt_template)
 
     async def get_speech_score(
         self,
@@ -100,18 +121,46 @@ class VerdictExtractor:
             ).winner
         )
 
-    @staticmethod
+    async def get_debater_scores_and_winner(
+        self, info: DebateInfo, judgment: str, /, *, model: ModelClient, parser: JSONParser
+    ) -> tuple[dict[DebaterName, tuple[int, str]], DebaterName]:
+        verdict: FullVerdict = await self._generate(
+            self.config.verdict_prompt_template,
+            FullVerdict,
+            model,
+            parser,
+            info=info,
+            judgment=judgment,
+        )
+
+        return {
+            debater.debater_name: (debater.score, debater.judgment) for debater in verdict.debaters
+        }, DebaterName(verdict.winner)
+
     async def _generate(
-        template: str, output_type: type[T], model: ModelClient, parser: JSONParser, /, **kwargs
+        self,
+        template: str,
+        output_type: type[T],
+        model: ModelClient,
+        parser: JSONParser,
+        /,
+        **kwargs,
     ) -> T:
-        return await parser.parse(
-            (
+        if self.config.structured_output:
+            raw: str = (
+                await model.chat_structured(
+                    messages=make_single_chat(template, **kwargs),
+                    name=output_type.__name__,
+                    json_schema=parser.get_schema(output_type),
+                )
+            ).content
+        else:
+            raw = (
                 await model.chat_predict(
                     messages=make_single_chat(
                         f"{template}\n\n{parser.make_schema_prompt(output_type)}", **kwargs
                     )
                 )
-            ).content,
-            output_type,
-            fix_model=model,
-        )
+            ).content
+
+        return await parser.parse(raw, output_type, fix_model=model)
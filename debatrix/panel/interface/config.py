@@ -1,6 +1,6 @@
 from pydantic.dataclasses import dataclass
 
-from .common import ParserConfig, VerdictExtractorConfig
+from .common import MemoryConfig, ParserConfig, VerdictExtractorConfig
 from .judge import JudgeConfig
 from .panel import PanelConfig
 
@@ -11,3 +11,4 @@ class PanelInterfaceConfig:
     verdict_extractor_config: VerdictExtractorConfig
     judge_config: JudgeConfig
     panel_config: PanelConfig
+    memory_config: MemoryConfig = MemoryConfig()
@@ -24,6 +24,7 @@ class JudgeConfig:
     iterate_analysis: bool
     common_system_prompt: str
     templates: JudgeTemplates
+    separate_common_system_prompt: bool = False
 
     @field_validator("templates")
     @classmethod
@@ -1,4 +1,5 @@
-from asyncio import Task
+from collections.abc import Sequence
+from contextlib import nullcontext
 from typing import Any
 
 from ....core.action import JudgeAction
@@ -14,12 +15,12 @@ from ....core.common import (
 )
 from ....model import ChatMessage, ChatRole
 from ..common import (
-    BiModeTaskGroup,
     Helper,
     InterfaceWithHelper,
     Memory,
     MemoryType,
     PromptTemplate,
+    TurnKeeper,
 )
 from .base import JudgeInterfaceABC
 from .config import JudgeConfig, JudgeTemplateType
@@ -45,6 +46,10 @@ class HelperJudgeWrapper:
     def info(self) -> DebateInfo:
         return self._helper.debate_info
 
+    @property
+    def dimension_name(self) -> DimensionName:
+        return self._dimension_name
+
     @property
     def memory(self) -> Memory:
         return self._helper.get_dimension_memory(self._dimension_name)
@@ -76,6 +81,12 @@ class HelperJudgeWrapper:
 
 
 class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
+    def __init__(self, *, helper: Helper) -> None:
+        super().__init__(helper=helper)
+        self._ingest_turns: dict[DimensionName, TurnKeeper] = {}
+        self._commit_turns: dict[DimensionName, TurnKeeper] = {}
+        self._callback_turns: dict[DimensionName, TurnKeeper] = {}
+
     @property
     def config(self) -> JudgeConfig:
         return self._config
@@ -83,7 +94,11 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
     @config.setter
     def config(self, config: JudgeConfig) -> None:
         self._config = config
-        self.set_templates(config.templates, common_system_prompt=config.common_system_prompt)
+        self.set_templates(
+            config.templates,
+            common_system_prompt=config.common_system_prompt,
+            separate_common_system_prompt=config.separate_common_system_prompt,
+        )
 
     @property
     def allow_concurrency(self) -> bool:
@@ -105,11 +120,21 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
     def iterate_analysis(self) -> bool:
         return self.config.iterate_analysis and self.config.analyze_speech
 
+    @property
+    def ingest_only(self) -> bool:
+        return self.config.skip_speech_judgement and not self.config.analyze_speech
+
     async def create(self, dimension_name: DimensionName, /, *, dimension: DimensionInfo) -> None:
         await self._helper.add_dimension(dimension_name, dimension)
+        self._ingest_turns[dimension_name] = TurnKeeper()
+        self._commit_turns[dimension_name] = TurnKeeper()
+        self._callback_turns[dimension_name] = TurnKeeper()
 
     async def reset(self, dimension_name: DimensionName, /, *, debate_info: DebateInfo) -> None:
         await self._helper.get_dimension_memory(dimension_name).reset()
+        self._ingest_turns[dimension_name] = TurnKeeper()
+        self._commit_turns[dimension_name] = TurnKeeper()
+        self._callback_turns[dimension_name] = TurnKeeper()
 
     async def update(self, dimension_name: DimensionName, /, *, speech: Speech) -> None:
         wrapped = HelperJudgeWrapper(
@@ -120,17 +145,39 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
             allow_ai_callback=self.allow_ai_callback,
         )
 
-        comment: str = await self.in_update(wrapped, speech=speech)
-        score: int = 0
+        callback_turns: TurnKeeper = self._callback_turns[dimension_name]
 
-        if not self.skip_speech_judgement:
-            score = await self.helper.get_speech_score(
-                debater_name=speech.debater_name, judgment=comment
-            )
+        try:
+            if self.ingest_only:
+                await self.in_ingest(wrapped, speech=speech)
 
-        await wrapped.callback(f"# Comment\n\n{comment}")
-        await wrapped.callback(f"# Temporary Score of {speech.debater_name}: {score}")
-        await wrapped.close()
+                async with callback_turns.turn(speech.index):
+                    await wrapped.close()
+
+                return
+
+            with (
+                nullcontext(None)
+                if callback_turns.is_turn(speech.index)
+                else self.helper.buffer_callbacks()
+            ) as buffered:
+                comment: str = await self.in_update(wrapped, speech=speech)
+                score: int = 0
+
+                if not self.skip_speech_judgement:
+                    score = await self.helper.get_speech_score(
+                        debater_name=speech.debater_name, judgment=comment
+                    )
+
+            async with callback_turns.turn(speech.index):
+                if buffered is not None:
+                    await self.helper.flush_callbacks(buffered)
+
+                await wrapped.callback(f"# Comment\n\n{comment}")
+                await wrapped.callback(f"# Temporary Score of {speech.debater_name}: {score}")
+                await wrapped.close()
+        finally:
+            await callback_turns.advance(speech.index)
 
     async def judge(self, dimension_name: DimensionName, /) -> Verdict:
         wrapped = HelperJudgeWrapper(
@@ -143,28 +190,20 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
 
         judgment: str = await self.in_judge(wrapped)
 
-        async with BiModeTaskGroup(concurrent=self.allow_concurrency) as tg:
-            debater_tasks: list[Task[tuple[int, str]]] = [
-                tg.create_task(
-                    self.helper.get_debater_score_and_judgment(
-                        debater_name=debater_info.name, judgment=judgment
-                    )
-                )
-                for debater_info in self.helper.debate_info.all_debaters_info
-            ]
-
-            winner_task: Task[DebaterName] = tg.create_task(
-                self.helper.get_winner(judgment=judgment)
-            )
+        debater_results: list[tuple[int, str]]
+        winner: DebaterName
+        debater_results, winner = await self.helper.get_verdict(
+            judgment=judgment, concurrent=self.allow_concurrency
+        )
 
         debaters_verdict: tuple[DebaterVerdict, ...] = tuple(
             DebaterVerdict(debater_name=debater_info.name, score=score, comment=comment)
             for debater_info, (score, comment) in zip(
-                self.helper.debate_info.all_debaters_info, [task.result() for task in debater_tasks]
+                self.helper.debate_info.all_debaters_info, debater_results
             )
         )
 
-        winner_verdict = WinnerVerdict(winner=winner_task.result(), comment=judgment)
+        winner_verdict = WinnerVerdict(winner=winner, comment=judgment)
 
         for debater_verdict in debaters_verdict:
             await wrapped.callback(
@@ -176,31 +215,51 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
         await wrapped.close()
         return Verdict(debaters_verdict=debaters_verdict, winner_verdict=winner_verdict)
 
+    async def in_ingest(self, wrapped: HelperJudgeWrapper, /, *, speech: Speech) -> None:
+        try:
+            async with self._ingest_turns[wrapped.dimension_name].turn(speech.index):
+                await wrapped.memory.add_speech(
+                    speech, source=wrapped.assign_speech_source(speech), cut=False
+                )
+        finally:
+            await self._commit_turns[wrapped.dimension_name].advance(speech.index)
+
     async def in_update(self, wrapped: HelperJudgeWrapper, /, *, speech: Speech) -> str:
         memory: Memory = wrapped.memory
-        prev_speeches: list[tuple[str, str]] = self._fetch(memory, analysis=False)
-        prev_analyses: list[tuple[str, str]] = self._fetch(memory, analysis=True)
+        commit_turns: TurnKeeper = self._commit_turns[wrapped.dimension_name]
 
-        new_speech_source: str = wrapped.assign_speech_source(speech)
-        await memory.add_speech(speech, source=wrapped.assign_speech_source(speech), cut=False)
+        try:
+            async with self._ingest_turns[wrapped.dimension_name].turn(speech.index):
+                if self.iterate_analysis:
+                    await commit_turns.wait(speech.index)
 
-        analysis: str = ""
+                prev_speeches: Sequence[tuple[str, str]] = self._fetch(memory, analysis=False)
+                prev_analyses: Sequence[tuple[str, str]] = self._fetch(memory, analysis=True)
 
-        if not self.skip_speech_judgement or self.analyze_speech:
-            analysis = await wrapped.query(
-                JudgeTemplateType.UPDATE,
-                prev_content=prev_analyses if self.iterate_analysis else prev_speeches,
-                is_prev_analyses=self.iterate_analysis,
-                new_speech=speech,
-            )
+                new_speech_source: str = wrapped.assign_speech_source(speech)
+                await memory.add_speech(speech, source=new_speech_source, cut=False)
+
+            analysis: str = ""
+
+            if not self.skip_speech_judgement or self.analyze_speech:
+                analysis = await wrapped.query(
+                    JudgeTemplateType.UPDATE,
+                    prev_content=prev_analyses if self.iterate_analysis else prev_speeches,
+                    is_prev_analyses=self.iterate_analysis,
+                    new_speech=speech,
+                )
+
+            async with commit_turns.turn(speech.index):
+                await memory.add_analyses([analysis], source=new_speech_source)
 
-        await memory.add_analyses([analysis], source=new_speech_source)
-        return analysis
+            return analysis
+        finally:
+            await commit_turns.advance(speech.index)
 
     async def in_judge(self, wrapped: HelperJudgeWrapper, /) -> str:
         memory: Memory = wrapped.memory
-        speeches: list[tuple[str, str]] = self._fetch(memory, analysis=False)
-        analyses: list[tuple[str, str]] = self._fetch(memory, analysis=True)
+        speeches: Sequence[tuple[str, str]] = self._fetch(memory, analysis=False)
+        analyses: Sequence[tuple[str, str]] = self._fetch(memory, analysis=True)
 
         return await wrapped.query(
             JudgeTemplateType.JUDGE,
@@ -208,7 +267,7 @@ class JudgeInterface(JudgeInterfaceABC, InterfaceWithHelper[JudgeTemplateType]):
             is_content_analyses=self.analyze_speech,
         )
 
-    def _fetch(self, memory: Memory, /, *, analysis: bool) -> list[tuple[str, str]]:
+    def _fetch(self, memory: Memory, /, *, analysis: bool) -> Sequence[tuple[str, str]]:
         return memory.fetch(
             include_types=MemoryType.ANALYSIS if analysis else MemoryType.SPEECH, format_source=True
         )
@@ -20,6 +20,7 @@ class PanelConfig:
     allow_ai_callback: bool
     common_system_prompt: str
     templates: PanelTemplates
+    separate_common_system_prompt: bool = False
 
     @field_validator("templates")
     @classmethod
@@ -1,4 +1,3 @@
-from asyncio import Task
 from typing import Any, TypeVar
 
 from pydantic import BaseModel
@@ -6,6 +5,7 @@ from pydantic import BaseModel
 from ....core.action import PanelAction
 from ....core.common import (
     DebateInfo,
+    DebaterName,
     DebaterVerdict,
     DimensionalVerdict,
     DimensionInfo,
@@ -14,7 +14,7 @@ from ....core.common import (
     WinnerVerdict,
 )
 from ....model import ChatMessage, ChatRole
-from ..common import BiModeTaskGroup, Helper, InterfaceWithHelper, PromptTemplate
+from ..common import Helper, InterfaceWithHelper, PromptTemplate
 from .base import PanelInterfaceABC
 from .config import PanelConfig, PanelTemplateType
 
@@ -63,7 +63,11 @@ class PanelInterface(PanelInterfaceABC, InterfaceWithHelper[PanelTemplateType]):
     @config.setter
     def config(self, config: PanelConfig) -> None:
         self._config = config
-        self.set_templates(config.templates, common_system_prompt=config.common_system_prompt)
+        self.set_templates(
+            config.templates,
+            common_system_prompt=config.common_system_prompt,
+            separate_common_system_prompt=config.separate_common_system_prompt,
+        )
 
     @property
     def allow_concurrency(self) -> bool:
@@ -89,26 +93,20 @@ class PanelInterface(PanelInterfaceABC, InterfaceWithHelper[PanelTemplateType]):
 
         judgment: str = await self.in_summarize(wrapped, verdicts=verdicts)
 
-        async with BiModeTaskGroup(concurrent=self.allow_concurrency) as tg:
-            debater_tasks: list[Task[tuple[int, str]]] = [
-                tg.create_task(
-                    self.helper.get_debater_score_and_judgment(
-                        debater_name=debater_info.name, judgment=judgment
-                    )
-                )
-                for debater_info in self.helper.debate_info.all_debaters_info
-            ]
-
-            winner_task: Task[str] = tg.create_task(self.helper.get_winner(judgment=judgment))
+        debater_results: list[tuple[int, str]]
+        winner: DebaterName
+        debater_results, winner = await self.helper.get_verdict(
+            judgment=judgment, concurrent=self.allow_concurrency
+        )
 
         debaters_verdict: tuple[DebaterVerdict, ...] = tuple(
             DebaterVerdict(debater_name=debater_info.name, score=score, comment=comment)
             for debater_info, (score, comment) in zip(
-                self.helper.debate_info.all_debaters_info, [task.result() for task in debater_tasks]
+                self.helper.debate_info.all_debaters_info, debater_results
             )
         )
 
-        winner_verdict = WinnerVerdict(winner=winner_task.result(), comment=judgment)
+        winner_verdict = WinnerVerdict(winner=winner, comment=judgment)
 
         for debater_verdict in debaters_verdict:
             await wrapped.callback(
@@ -36,6 +36,7 @@ class PanelInterfaceServer(APIServer):
 
         self.assign("/{session_id}/panel/create", self._panel_create)
         self.assign("/{session_id}/panel/reset", self._panel_reset)
+        self.assign("/{session_id}/panel/update", self._panel_update)
         self.assign("/{session_id}/panel/summarize", self._panel_summarize)
 
     async def callback(
@@ -71,6 +72,7 @@ class PanelInterfaceServer(APIServer):
     async def _configure(self, session_id: str, config: PanelInterfaceConfig) -> None:
         self._interfaces[session_id][0].parser_config = config.parser_config
         self._interfaces[session_id][0].verdict_extractor_config = config.verdict_extractor_config
+        self._interfaces[session_id][0].memory_config = config.memory_config
         self._interfaces[session_id][1].config = config.judge_config
         self._interfaces[session_id][2].config = config.panel_config
 
@@ -98,6 +100,13 @@ class PanelInterfaceServer(APIServer):
     async def _panel_reset(self, session_id: str, debate_info: DebateInfo) -> None:
         await self._interfaces[session_id][2].reset(debate_info=debate_info)
 
+    async def _panel_update(self, session_id: str, speech: Speech) -> None:
+        helper, judge_interface, _ = self._interfaces[session_id]
+
+        async with TaskGroup() as tg:
+            for dimension in helper.dimensions:
+                tg.create_task(judge_interface.update(dimension.name, speech=speech))
+
     async def _panel_summarize(
         self, session_id: str, verdicts: list[DimensionalVerdict]
     ) -> Verdict:
@@ -77,6 +77,7 @@ class ConfigBuffer:
         return ManagerConfig(
             should_summarize=config.should_summarize,
             dimensions=ConfigBuffer._get_valid_dimensions(dimensions=config.dimensions),
+            update_window=config.update_window,
         )
 
     @staticmethod
@@ -12,6 +12,10 @@ class ManagerConfigUI(BaseUI[list[Any]]):
                 config, "should_summarize"
             )
 
+            ui.number(
+                label="Speech Update Window", min=1, precision=0, step=1, format="%d"
+            ).classes("w-full").bind_value(config, target_name="update_window", forward=int)
+
             for dimension in config["dimensions"]:
                 with ui.card().classes("w-full"):
                     ui.label(text=dimension["name"].capitalize()).classes("w-full text-lg")
@@ -40,6 +40,10 @@ class PanelInterfaceConfigUI(BaseUI[dict[str, Any]]):
                     judge_config, target_name="iterate_analysis"
                 ).bind_enabled_from(judge_config, target_name="analyze_speech")
 
+                ui.switch("Separate Common System Prompt").classes("w-full").bind_value(
+                    judge_config, target_name="separate_common_system_prompt"
+                )
+
                 with ui.expansion(text="Common System Prompt").classes("w-full"):
                     ui.textarea(label="Common System Prompt").props("autogrow").classes(
                         "w-full"
@@ -69,6 +73,10 @@ class PanelInterfaceConfigUI(BaseUI[dict[str, Any]]):
                     panel_config, target_name="allow_ai_callback"
                 ).bind_enabled_from(panel_config, target_name="allow_concurrency", backward=not_)
 
+                ui.switch("Separate Common System Prompt").classes("w-full").bind_value(
+                    panel_config, target_name="separate_common_system_prompt"
+                )
+
                 with ui.expansion(text="Common System Prompt").classes("w-full"):
                     ui.textarea(label="Common System Prompt").props("autogrow").classes(
                         "w-full"